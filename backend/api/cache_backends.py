@@ -0,0 +1,135 @@
+import pickle
+import zlib
+from datetime import datetime, timedelta
+from bson.binary import Binary
+from django.core.cache.backends.base import BaseCache, DEFAULT_TIMEOUT
+from pymongo import UpdateOne
+from pymongo.errors import DuplicateKeyError
+
+
+class MongoCache(BaseCache):
+    """
+    Django cache backend storing entries in a MongoDB collection.
+
+    Values are pickled and zlib-compressed, and expire through a TTL index on
+    `expires_at` (declared in the index registry), so every gunicorn worker
+    and every script that sets up Django shares one cache that survives
+    restarts.
+
+    CACHES = {'default': {'BACKEND': 'api.cache_backends.MongoCache', 'LOCATION': 'cache_entries'}}
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        self._collection_name = location or 'cache_entries'
+        options = params.get('OPTIONS', {})
+        self._compress_level = options.get('COMPRESS_LEVEL', 6)
+
+    @property
+    def _collection(self):
+        # Imported lazily so settings can be loaded without touching MongoDB
+        from api.services.mongo_service import mongo_service
+        return mongo_service.db[self._collection_name]
+
+    def _expiry(self, timeout):
+        timeout = self.get_backend_timeout(timeout)
+        if timeout is None:
+            return None
+        return datetime.utcnow() + timedelta(seconds=timeout)
+
+    def _encode(self, value):
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        return Binary(zlib.compress(data, self._compress_level))
+
+    @staticmethod
+    def _decode(data):
+        return pickle.loads(zlib.decompress(data))
+
+    @staticmethod
+    def _live(now=None):
+        """Filter for entries that have not expired yet (the TTL monitor only runs every minute)"""
+        now = now or datetime.utcnow()
+        return {'$or': [{'expires_at': None}, {'expires_at': {'$gt': now}}]}
+
+    def _document(self, key, value, timeout):
+        return {'value': self._encode(value), 'expires_at': self._expiry(timeout)}
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        now = datetime.utcnow()
+        # Only replace a missing or expired entry
+        result = self._collection.update_one(
+            {'_id': key, 'expires_at': {'$ne': None, '$lte': now}},
+            {'$set': self._document(key, value, timeout)}
+        )
+        if result.modified_count:
+            return True
+        try:
+            result = self._collection.update_one(
+                {'_id': key},
+                {'$setOnInsert': self._document(key, value, timeout)},
+                upsert=True
+            )
+        except DuplicateKeyError:
+            # A concurrent add won the race
+            return False
+        return result.upserted_id is not None
+
+    def get(self, key, default=None, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        doc = self._collection.find_one({'_id': key, **self._live()}, {'value': 1})
+        if doc is None:
+            return default
+        return self._decode(doc['value'])
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        self._collection.update_one(
+            {'_id': key},
+            {'$set': self._document(key, value, timeout)},
+            upsert=True
+        )
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        result = self._collection.update_one(
+            {'_id': key, **self._live()},
+            {'$set': {'expires_at': self._expiry(timeout)}}
+        )
+        return result.matched_count > 0
+
+    def delete(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._collection.delete_one({'_id': key}).deleted_count > 0
+
+    def has_key(self, key, version=None):
+        key = self.make_and_validate_key(key, version=version)
+        return self._collection.count_documents({'_id': key, **self._live()}, limit=1) > 0
+
+    def get_many(self, keys, version=None):
+        key_map = {self.make_and_validate_key(key, version=version): key for key in keys}
+        if not key_map:
+            return {}
+        docs = self._collection.find({'_id': {'$in': list(key_map)}, **self._live()}, {'value': 1})
+        return {key_map[doc['_id']]: self._decode(doc['value']) for doc in docs}
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        operations = [
+            UpdateOne(
+                {'_id': self.make_and_validate_key(key, version=version)},
+                {'$set': self._document(key, value, timeout)},
+                upsert=True
+            )
+            for key, value in data.items()
+        ]
+        if operations:
+            self._collection.bulk_write(operations, ordered=False)
+        return []
+
+    def delete_many(self, keys, version=None):
+        keys = [self.make_and_validate_key(key, version=version) for key in keys]
+        if keys:
+            self._collection.delete_many({'_id': {'$in': keys}})
+
+    def clear(self):
+        self._collection.delete_many({})
@@ -0,0 +1,78 @@
+from django.core.management.base import BaseCommand, CommandError
+from pymongo import UpdateOne
+from api.services.mongo_service import mongo_service
+from api.services.vocabulary_service import normalize_word
+
+
+class Command(BaseCommand):
+    help = (
+        'Set normalized_word on every global_words entry, merge entries that normalize '
+        'to the same key, then build the unique normalized_word index'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Report what would change without writing anything'
+        )
+
+    def handle(self, *args, **options):
+        db = mongo_service.db
+        dry_run = options['dry_run']
+
+        groups = {}
+        for word in db.global_words.find({}, {'word': 1, 'normalized_word': 1, 'frequency': 1, 'created_at': 1}):
+            groups.setdefault(normalize_word(word.get('word')), []).append(word)
+
+        updates = []
+        merged = 0
+        for normalized, words in groups.items():
+            # Keep the most looked-up entry, oldest first on ties
+            words.sort(key=lambda w: (-w.get('frequency', 0), w['_id']))
+            keeper, duplicates = words[0], words[1:]
+
+            update = {}
+            if keeper.get('normalized_word') != normalized:
+                update['$set'] = {'normalized_word': normalized}
+            if duplicates:
+                update['$inc'] = {'frequency': sum(w.get('frequency', 0) for w in duplicates)}
+                self.stdout.write(f"'{normalized}': merging {len(duplicates)} duplicate(s) into {keeper['_id']}")
+                merged += len(duplicates)
+                if not dry_run:
+                    self._merge_user_words(db, keeper['_id'], [w['_id'] for w in duplicates])
+                    db.global_words.delete_many({'_id': {'$in': [w['_id'] for w in duplicates]}})
+            if update:
+                updates.append(UpdateOne({'_id': keeper['_id']}, update))
+
+        if updates and not dry_run:
+            db.global_words.bulk_write(updates, ordered=False)
+        self.stdout.write(f"{len(updates)} word(s) updated, {merged} duplicate(s) merged")
+        if dry_run:
+            return
+        if merged:
+            self.stdout.write(
+                "Running web workers keep merged entries cached for up to VOCABULARY_CACHE_TTL "
+                "seconds; restart them to pick up the merge immediately"
+            )
+
+        report = mongo_service.ensure_indexes(['global_words'])['global_words']
+        if report['errors']:
+            raise CommandError(f"Failed to build global_words indexes: {report['errors']}")
+        self.stdout.write(self.style.SUCCESS("global_words is normalized and indexed"))
+
+    @staticmethod
+    def _merge_user_words(db, keeper_id, duplicate_ids):
+        """Point user_words at the kept entry, dropping references the user already has"""
+        for user_word in db.user_words.find({'word_id': {'$in': duplicate_ids}}):
+            has_keeper = db.user_words.count_documents(
+                {'user_id': user_word['user_id'], 'word_id': keeper_id}, limit=1
+            )
+            if has_keeper:
+                db.user_words.update_one(
+                    {'user_id': user_word['user_id'], 'word_id': keeper_id},
+                    {'$max': {'is_favorite': user_word.get('is_favorite', False)}}
+                )
+                db.user_words.delete_one({'_id': user_word['_id']})
+            else:
+                db.user_words.update_one({'_id': user_word['_id']}, {'$set': {'word_id': keeper_id}})
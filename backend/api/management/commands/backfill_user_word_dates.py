@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+from api.services.mongo_service import mongo_service
+
+
+class Command(BaseCommand):
+    help = (
+        'Set created_at on user_words entries that lack it, from their ObjectId timestamp, '
+        'so every entry can be reached by the created_at cursor pagination'
+    )
+
+    def handle(self, *args, **options):
+        result = mongo_service.db.user_words.update_many(
+            {'created_at': {'$exists': False}},
+            [{'$set': {'created_at': {'$toDate': '$_id'}}}]
+        )
+        self.stdout.write(self.style.SUCCESS(f"Set created_at on {result.modified_count} user words"))
@@ -0,0 +1,56 @@
+from django.core.management.base import BaseCommand, CommandError
+from api.services.mongo_service import mongo_service, INDEXES
+
+
+class Command(BaseCommand):
+    help = 'Create or reconcile the MongoDB indexes declared in api.services.mongo_service.INDEXES'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            'collections',
+            nargs='*',
+            help='Collections to reconcile (default: all registered collections)'
+        )
+        parser.add_argument(
+            '--prune',
+            action='store_true',
+            help='Drop indexes that are not declared in the registry'
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Explain the hot queries afterwards and fail if any still uses a collection scan'
+        )
+
+    def handle(self, *args, **options):
+        unknown = [name for name in options['collections'] if name not in INDEXES]
+        if unknown:
+            raise CommandError(f"No indexes registered for: {', '.join(unknown)}")
+
+        report = mongo_service.ensure_indexes(
+            collections=options['collections'] or None,
+            prune=options['prune']
+        )
+
+        failed = False
+        for collection, result in report.items():
+            for key in ('created', 'rebuilt', 'dropped'):
+                for index_name in result[key]:
+                    self.stdout.write(self.style.SUCCESS(f"{collection}: {key} {index_name}"))
+            for index_name in result['extra']:
+                self.stdout.write(self.style.WARNING(f"{collection}: undeclared index {index_name} (use --prune to drop)"))
+            for error in result['errors']:
+                failed = True
+                self.stderr.write(self.style.ERROR(f"{collection}: failed to build {error}"))
+
+        if options['check']:
+            scans = mongo_service.find_collection_scans()
+            for collection, query in scans:
+                failed = True
+                self.stderr.write(self.style.ERROR(f"{collection}: collection scan for {sorted(query)}"))
+            if not scans:
+                self.stdout.write(self.style.SUCCESS("All registered query shapes use an index"))
+
+        if failed:
+            raise CommandError("Index reconciliation finished with problems")
+        self.stdout.write(self.style.SUCCESS("Indexes are up to date"))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from api.services.mongo_service import mongo_service
+from api.services.vocabulary_service import vocabulary_service
+
+
+class Command(BaseCommand):
+    help = 'Add the vocabulary of already processed transcripts to the global_words dictionary'
+
+    def handle(self, *args, **options):
+        db = mongo_service.db
+        projection = {'video_id': 1, 'language': 1, 'vocabulary': 1}
+
+        added = 0
+        videos = 0
+        for collection in (db.processed_videos, db.transcripts):
+            for doc in collection.find({'vocabulary.0': {'$exists': True}}, projection):
+                added += vocabulary_service.ingest_vocabulary(
+                    doc['vocabulary'], doc.get('video_id'), doc.get('language')
+                )
+                videos += 1
+
+        self.stdout.write(self.style.SUCCESS(f"Added {added} words from {videos} transcripts"))
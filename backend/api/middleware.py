@@ -1,11 +1,66 @@
-from django.utils.functional import SimpleLazyObject
+from django.conf import settings
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.exceptions import AuthenticationFailed
-from django.contrib.auth.models import AnonymousUser
-from bson import ObjectId
-from .services.user_service import user_service
+from .services.memory_cache import LRUCache
+
+
+class MongoUser:
+    """Authenticated user identified by a MongoDB user ID from the JWT"""
+
+    __slots__ = ('id', 'user_id')
+
+    is_authenticated = True
+    is_active = True
+    is_anonymous = False
+
+    def __init__(self, user_id):
+        self.id = user_id
+        self.user_id = user_id
+
 
 class MongoJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication for MongoDB users.
+
+    Verified access tokens are kept in a small LRU until their `exp`, so a
+    token is only signature-checked on its first request in each worker,
+    and the result of MongoUserMiddleware is reused by DRF instead of
+    validating the token a second time.
+    """
+
+    _verified_tokens = None
+
+    @classmethod
+    def verified_tokens(cls):
+        if cls._verified_tokens is None:
+            cls._verified_tokens = LRUCache(
+                max_bytes=getattr(settings, 'JWT_VERIFIED_CACHE_MAX_BYTES', 1024 * 1024)
+            )
+        return cls._verified_tokens
+
+    def authenticate(self, request):
+        # Reuse the result of MongoUserMiddleware for this request
+        auth = getattr(getattr(request, '_request', request), 'mongo_auth', None)
+        if auth is not None:
+            return auth
+        return super().authenticate(request)
+
+    def get_validated_token(self, raw_token):
+        """
+        Overridden to serve recently verified tokens from memory. Entries are
+        keyed by the complete token, so a cached result only ever applies to
+        the exact header, payload and signature that were verified.
+        """
+        key = raw_token.decode('utf-8') if isinstance(raw_token, bytes) else raw_token
+        cache = self.verified_tokens()
+        validated_token = cache.get(key)
+        if validated_token is None:
+            validated_token = super().get_validated_token(raw_token)
+            expires_at = validated_token.get('exp')
+            if expires_at:
+                cache.set(key, validated_token, expires_at=expires_at)
+        return validated_token
+
     def get_user(self, validated_token):
         """
         Overridden to handle MongoDB ObjectId user IDs
@@ -14,44 +69,40 @@ class MongoJWTAuthentication(JWTAuthentication):
             user_id = validated_token['user_id']
             if user_id is None:
                 return None
-            
-            # Create a simple user object with the MongoDB ID
-            user = type('MongoUser', (), {
-                'id': user_id,
-                'is_authenticated': True,
-                'is_active': True,
-                'user_id': user_id  # Add user_id as a property of the user object
-            })()
-            
-            return user
+            return MongoUser(user_id)
         except KeyError:
             raise AuthenticationFailed('No user ID in token')
         except Exception as e:
             raise AuthenticationFailed(str(e))
 
+
 class MongoUserMiddleware:
     def __init__(self, get_response):
         self.get_response = get_response
+        self.jwt_auth = MongoJWTAuthentication()
 
     def __call__(self, request):
         # Initialize user_id as None
         request.user_id = None
-        
+        request.mongo_auth = None
+
         # Try to get the JWT token from the Authorization header
-        auth_header = request.headers.get('Authorization', '')
-        if auth_header.startswith('Bearer '):
+        header = self.jwt_auth.get_header(request)
+        if header is not None:
             try:
-                # Extract and validate the token
-                jwt_auth = MongoJWTAuthentication()
-                token = auth_header.split(' ')[1]
-                validated_token = jwt_auth.get_validated_token(token)
-                
-                # Set user_id from the token
-                request.user_id = validated_token.get('user_id')
+                # Extract and validate the token once; DRF reuses the result
+                raw_token = self.jwt_auth.get_raw_token(header)
+                if raw_token is not None:
+                    validated_token = self.jwt_auth.get_validated_token(raw_token)
+                    user = self.jwt_auth.get_user(validated_token)
+                    if user is not None:
+                        request.mongo_auth = (user, validated_token)
+                        # Set user_id from the token
+                        request.user_id = user.user_id
             except Exception as e:
                 # Log the error but continue processing the request
                 print(f"Error processing JWT token: {str(e)}")
                 pass
-        
+
         response = self.get_response(request)
-        return response 
\ No newline at end of file
+        return response
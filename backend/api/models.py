@@ -16,7 +16,10 @@ Collections:
     'language': str,
     'created_at': datetime,
     'updated_at': datetime,
-    'is_favorite': bool
+    'is_favorite': bool,
+    'translation': str,
+    'vocabulary': list[dict],
+    'processed_video_id': str   # Reference to processed_videos
 }
 
 2. qa_pairs
@@ -40,7 +43,9 @@ Collections:
     'user_id': str,
     'video_id': str,
     'type': str,
-    'answers': dict,
+    'attempts': int,
+    'correct_attempts': int,
+    'answers': dict,     # question_id -> {attempts, correct_attempts, last_correct, last_answered_at}
     'updated_at': datetime
 }
 
@@ -49,8 +54,10 @@ Collections:
 {
     '_id': ObjectId,
     'word': str,          # The Hindi word
+    'normalized_word': str,  # Unique lookup key (vocabulary_service.normalize_word)
     'meaning': str,       # Explanation from Deepseek
     'frequency': int,     # How many times users have queried this
+    'sources': list[dict],  # Transcripts the word was extracted from: {type, video_id, language}
     'created_at': datetime,
     'last_updated': datetime
 }
@@ -64,4 +71,97 @@ Collections:
     'notes': str,        # Optional personal notes
     'created_at': datetime
 }
+
+6. processed_videos
+{
+    '_id': ObjectId,
+    'video_id': str,
+    'language': str,
+    'punctuated_text': str,
+    'translation': str,
+    'vocabulary': list[dict],
+    'created_at': datetime
+}
+
+7. leases
+{
+    '_id': str,          # Lease key, e.g. 'processed_video:<video_id>:<language>'
+    'owner': str,        # host:pid:uuid of the holder
+    'expires_at': datetime
+}
+
+8. import_jobs
+{
+    '_id': ObjectId,
+    'user_id': str,
+    'video_id': str,
+    'title': str,
+    'status': str,       # queued/fetching/processing/saving/completed/failed
+    'active': bool,      # Present while queued or running; unique per user and video
+    'progress': int,     # 0-100
+    'result': dict,      # Saved transcript once completed
+    'error': str,
+    'created_at': datetime,
+    'updated_at': datetime  # Heartbeat while running
+}
+
+9. practice_summaries (optional, PRACTICE_SUMMARY_ENABLED)
+{
+    '_id': str,          # user_id
+    'sets': {
+        '<transcript_id>': {
+            'title': str,
+            'video_id': str,
+            'counts': {'<type>': int}
+        }
+    },
+    'built': bool,       # Set by a full recount; unbuilt summaries are recounted on read
+    'version': int,      # Bumped by every increment/removal, guards recounts against races
+    'pending': int,      # Question inserts in progress; no recount is stored meanwhile
+    'pending_at': datetime,
+    'updated_at': datetime
+}
+
+10. raw_transcripts
+{
+    '_id': ObjectId,
+    'video_id': str,
+    'language': str,
+    'segment_count': int,
+    'starts': Binary,     # zlib(float64 little-endian array) of segment start times
+    'durations': Binary,  # zlib(float64 little-endian array) of segment durations
+    'offsets': Binary,    # zlib(uint32 little-endian array) of segment end offsets in text
+    'text': Binary,       # zlib(UTF-8 concatenated segment text)
+    'created_at': datetime
+}
+
+11. user_answers (append-only answer log)
+{
+    '_id': ObjectId,
+    'user_id': str,
+    'question_id': str,
+    'transcript_id': str,
+    'video_id': str,
+    'type': str,
+    'answer': str,
+    'is_correct': bool,
+    'answered_at': datetime
+}
+
+12. word_frequency_buckets (hourly lookup counts for trending windows)
+{
+    '_id': ObjectId,
+    'word_id': ObjectId, # Reference to global_words
+    'bucket': datetime,  # Start of the hour
+    'count': int,
+    'expires_at': datetime
+}
+
+13. token_blacklist
+{
+    '_id': str,          # Refresh token JTI
+    'user_id': str,
+    'expires_at': datetime,  # Token expiry; removed by a TTL index
+    'blacklisted_at': datetime
+}
 """
\ No newline at end of file
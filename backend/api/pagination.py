@@ -0,0 +1,93 @@
+import base64
+import json
+from datetime import datetime
+from bson import ObjectId
+from django.conf import settings
+from rest_framework.exceptions import ValidationError
+
+
+class MongoCursorPagination:
+    """
+    Keyset (cursor) pagination for MongoDB queries.
+
+    Pages are ordered by `sort_field` with `_id` as tie-breaker and the cursor
+    encodes the sort key of the last returned document, so every page is one
+    indexed range query no matter how deep the client pages. Pagination is
+    opt-in: it applies when the request carries `cursor` or `page_size`.
+    """
+
+    def __init__(self, request, sort_field='_id', direction=1):
+        self.params = request.query_params
+        self.sort_field = sort_field
+        self.direction = direction
+
+    @property
+    def enabled(self):
+        return 'cursor' in self.params or 'page_size' in self.params
+
+    @property
+    def page_size(self):
+        default_size = getattr(settings, 'API_PAGE_SIZE', 50)
+        max_size = getattr(settings, 'API_MAX_PAGE_SIZE', 200)
+        try:
+            size = int(self.params.get('page_size', default_size))
+        except ValueError:
+            raise ValidationError({'page_size': 'Must be an integer'})
+        return max(1, min(size, max_size))
+
+    @property
+    def sort(self):
+        """Sort specification matching the cursor order"""
+        if self.sort_field == '_id':
+            return [('_id', self.direction)]
+        return [(self.sort_field, self.direction), ('_id', self.direction)]
+
+    def filter(self, query):
+        """Return query restricted to documents after the request cursor"""
+        cursor = self.params.get('cursor')
+        if not cursor:
+            return query
+
+        last_value, last_id = self._decode(cursor)
+        op = '$gt' if self.direction == 1 else '$lt'
+        if self.sort_field == '_id':
+            condition = {'_id': {op: last_id}}
+        else:
+            condition = {'$or': [
+                {self.sort_field: {op: last_value}},
+                {self.sort_field: last_value, '_id': {op: last_id}}
+            ]}
+        return {'$and': [query, condition]} if query else condition
+
+    def paginate(self, documents):
+        """
+        Split a result fetched with limit(page_size + 1) into the page and next cursor
+        Returns:
+            tuple: (page documents, next cursor or None)
+        """
+        page = documents[:self.page_size]
+        if len(documents) <= self.page_size or not page:
+            return page, None
+        last = page[-1]
+        return page, self._encode(last.get(self.sort_field), last['_id'])
+
+    def _encode(self, value, doc_id):
+        if isinstance(value, datetime):
+            value = {'$date': value.isoformat()}
+        elif isinstance(value, ObjectId):
+            value = str(value)
+        payload = json.dumps({'v': value, 'i': str(doc_id)}, separators=(',', ':'))
+        return base64.urlsafe_b64encode(payload.encode('utf-8')).decode('ascii')
+
+    def _decode(self, cursor):
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            value = payload['v']
+            if isinstance(value, dict) and '$date' in value:
+                value = datetime.fromisoformat(value['$date'])
+            doc_id = ObjectId(payload['i'])
+        except Exception:
+            raise ValidationError({'cursor': 'Invalid cursor'})
+        if self.sort_field == '_id':
+            value = doc_id
+        return value, doc_id
@@ -1,4 +1,6 @@
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenRefreshSerializer
+from .tokens import MongoRefreshToken
 
 class UserSerializer(serializers.Serializer):
     id = serializers.CharField()
@@ -8,28 +10,37 @@ class UserSerializer(serializers.Serializer):
     date_joined = serializers.DateTimeField(read_only=True)
     last_login = serializers.DateTimeField(read_only=True)
 
-class TranscriptSerializer(serializers.Serializer):
+class TranscriptSummarySerializer(serializers.Serializer):
+    """Lightweight transcript representation for list views"""
     id = serializers.CharField(read_only=True)
     user_id = serializers.CharField(read_only=True)
     video_id = serializers.CharField()
     title = serializers.CharField(required=False)
-    content = serializers.CharField()  # This will now be the punctuated text
     language = serializers.CharField()
     created_at = serializers.DateTimeField(read_only=True)
     updated_at = serializers.DateTimeField(read_only=True)
     is_favorite = serializers.BooleanField(default=False)
-    translation = serializers.CharField(required=False)  # New field for English translation
-    vocabulary = serializers.JSONField(required=False)  # New field for vocabulary
+    question_counts = serializers.SerializerMethodField()
     questions = serializers.SerializerMethodField()
 
+    def get_question_counts(self, obj):
+        # Counts are fetched for all transcripts at once by the view
+        return self.context.get('question_counts', {}).get(str(obj['id']), {})
+
     def get_questions(self, obj):
-        from api.services.mongo_service import mongo_service
-        # Get questions from MongoDB
-        questions = list(mongo_service.db.qa_pairs.find({'transcript_id': str(obj['id'])}))
-        # Convert ObjectIds to strings
-        for question in questions:
-            question['_id'] = str(question['_id'])
-        return questions
+        return self.context.get('questions', {}).get(str(obj['id']), [])
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # Questions are only embedded when the view fetched them (?expand=questions)
+        if 'questions' not in self.context:
+            data.pop('questions', None)
+        return data
+
+class TranscriptSerializer(TranscriptSummarySerializer):
+    content = serializers.CharField()  # This will now be the punctuated text
+    translation = serializers.CharField(required=False)  # New field for English translation
+    vocabulary = serializers.JSONField(required=False)  # New field for vocabulary
 
 class QuestionSerializer(serializers.Serializer):
     id = serializers.CharField(read_only=True)
@@ -43,4 +54,8 @@ class QuestionSerializer(serializers.Serializer):
     created_at = serializers.DateTimeField(read_only=True)
     attempts = serializers.IntegerField(read_only=True)
     correct_attempts = serializers.IntegerField(read_only=True)
-    is_favorite = serializers.BooleanField(default=False) 
\ No newline at end of file
+    is_favorite = serializers.BooleanField(default=False)
+
+class MongoTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh (and rotate) tokens using the MongoDB-backed blacklist"""
+    token_class = MongoRefreshToken
@@ -0,0 +1,113 @@
+from bson import ObjectId
+from django.conf import settings
+from pymongo import ReturnDocument
+from .mongo_service import mongo_service
+from .progress_service import progress_service
+from .write_behind import IncrementBuffer
+
+
+class AnswerService:
+    """
+    Records answer attempts against qa_pairs counters.
+
+    By default each answer takes two round trips: a find_one reads the stored
+    answer, which is compared with the submitted one in Python (MongoDB's
+    $toLower only folds ASCII), then one atomic find_one_and_update increments
+    the counters and returns their new values. With ANSWER_WRITE_BEHIND enabled the increments are batched
+    through an IncrementBuffer instead.
+    Answers from a known user are also recorded in their progress.
+    """
+
+    PROJECTION = {
+        'answer': 1, 'attempts': 1, 'correct_attempts': 1,
+        'transcript_id': 1, 'video_id': 1, 'type': 1
+    }
+
+    def __init__(self):
+        self._buffer = None
+
+    @property
+    def write_behind(self):
+        return getattr(settings, 'ANSWER_WRITE_BEHIND', False)
+
+    @property
+    def buffer(self):
+        if self._buffer is None:
+            self._buffer = IncrementBuffer(
+                lambda: mongo_service.db.qa_pairs,
+                flush_interval=getattr(settings, 'ANSWER_FLUSH_INTERVAL', 2.0),
+                max_pending=getattr(settings, 'ANSWER_FLUSH_MAX_PENDING', 500)
+            )
+        return self._buffer
+
+    @staticmethod
+    def normalize(answer):
+        return (answer or '').strip().lower()
+
+    def record_answer(self, question_id, submitted_answer, transcript_id=None, user_id=None):
+        """
+        Check a submitted answer and count the attempt
+        Args:
+            question_id (str): qa_pairs document ID
+            submitted_answer (str): Answer given by the user
+            transcript_id (str): Restrict the match to questions of this transcript
+            user_id (str): User who answered, recorded in their progress
+        Returns:
+            dict: is_correct, correct_answer, attempts and correct_attempts, or None if not found
+        """
+        query = {'_id': ObjectId(question_id)}
+        if transcript_id is not None:
+            query['transcript_id'] = transcript_id
+
+        if self.write_behind:
+            question, is_correct = self._record_buffered(query, submitted_answer)
+        else:
+            question, is_correct = self._record_atomic(query, submitted_answer)
+        if question is None:
+            return None
+
+        if user_id:
+            progress_service.record_answer(user_id, question, submitted_answer, is_correct)
+        return self._result(question, is_correct)
+
+    def _record_atomic(self, query, submitted_answer):
+        stored = mongo_service.db.qa_pairs.find_one(query, {'answer': 1})
+        if stored is None:
+            return None, False
+        is_correct = self.normalize(stored.get('answer')) == self.normalize(submitted_answer)
+
+        question = mongo_service.db.qa_pairs.find_one_and_update(
+            {'_id': stored['_id']},
+            {'$inc': {'attempts': 1, 'correct_attempts': 1 if is_correct else 0}},
+            projection=self.PROJECTION,
+            return_document=ReturnDocument.AFTER
+        )
+        if question is None:
+            return None, False
+        return question, is_correct
+
+    def _record_buffered(self, query, submitted_answer):
+        question = mongo_service.db.qa_pairs.find_one(query, self.PROJECTION)
+        if question is None:
+            return None, False
+        is_correct = self.normalize(question.get('answer')) == self.normalize(submitted_answer)
+        self.buffer.add(question['_id'], {'attempts': 1, 'correct_attempts': 1 if is_correct else 0})
+
+        # Report the counters including increments that have not been flushed yet
+        pending = self.buffer.pending(question['_id'])
+        question['attempts'] = question.get('attempts', 0) + pending.get('attempts', 0)
+        question['correct_attempts'] = question.get('correct_attempts', 0) + pending.get('correct_attempts', 0)
+        return question, is_correct
+
+    @staticmethod
+    def _result(question, is_correct):
+        return {
+            'is_correct': is_correct,
+            'correct_answer': (question.get('answer') or '').strip(),
+            'attempts': question.get('attempts', 0),
+            'correct_attempts': question.get('correct_attempts', 0)
+        }
+
+
+# Create singleton instance
+answer_service = AnswerService()
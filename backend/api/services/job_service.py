@@ -0,0 +1,182 @@
+import logging
+import threading
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from bson import ObjectId
+from django.conf import settings
+from pymongo.errors import DuplicateKeyError
+from .mongo_service import mongo_service
+from .transcript_service import transcript_service
+
+logger = logging.getLogger(__name__)
+
+
+class ImportJobService:
+    """
+    Background transcript imports.
+
+    Jobs are recorded in the `import_jobs` collection and executed on an
+    in-process thread pool, so the request worker returns immediately and the
+    client polls the job status.
+
+    An active job carries `active: True`, which a unique partial index keeps
+    to one job per user and video. Running jobs refresh `updated_at` every
+    TRANSCRIPT_IMPORT_HEARTBEAT_INTERVAL seconds; a job whose worker died
+    stops doing so and is marked failed once it is older than
+    TRANSCRIPT_IMPORT_STALE_SECONDS, so the video can be imported again.
+    """
+
+    ACTIVE_STATUSES = ['queued', 'fetching', 'processing', 'saving']
+
+    def __init__(self):
+        self._executor = None
+        self._lock = threading.Lock()
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=getattr(settings, 'TRANSCRIPT_IMPORT_WORKERS', 2),
+                        thread_name_prefix='transcript-import'
+                    )
+        return self._executor
+
+    @property
+    def heartbeat_interval(self):
+        return getattr(settings, 'TRANSCRIPT_IMPORT_HEARTBEAT_INTERVAL', 30)
+
+    @property
+    def stale_after(self):
+        return timedelta(seconds=getattr(settings, 'TRANSCRIPT_IMPORT_STALE_SECONDS', 180))
+
+    @property
+    def collection(self):
+        return mongo_service.db.import_jobs
+
+    def submit_import(self, user_id, video_id, title='Untitled'):
+        """
+        Queue a transcript import, reusing an active job for the same video
+        Returns:
+            dict: The job document
+        """
+        active_job = self._find_active(user_id, video_id)
+        if active_job:
+            return active_job
+
+        now = datetime.utcnow()
+        job = {
+            'user_id': user_id,
+            'video_id': video_id,
+            'title': title,
+            'status': 'queued',
+            'active': True,
+            'progress': 0,
+            'result': None,
+            'error': None,
+            'created_at': now,
+            'updated_at': now
+        }
+        try:
+            job['_id'] = self.collection.insert_one(job).inserted_id
+        except DuplicateKeyError:
+            # Another worker queued the same import first
+            active_job = self._find_active(user_id, video_id)
+            if active_job:
+                return active_job
+            raise
+        self.executor.submit(self._run_import, job['_id'], user_id, video_id, title)
+        return job
+
+    def _find_active(self, user_id, video_id):
+        """Get the active job for a video, failing it first if its worker stopped heartbeating"""
+        active_job = self.collection.find_one({'user_id': user_id, 'video_id': video_id, 'active': True})
+        if not active_job or active_job['updated_at'] >= datetime.utcnow() - self.stale_after:
+            return active_job
+
+        # Only the request that sees the stale heartbeat unchanged fails the job
+        self.collection.update_one(
+            {'_id': active_job['_id'], 'active': True, 'updated_at': active_job['updated_at']},
+            {
+                '$set': {
+                    'status': 'failed',
+                    'error': 'Import was interrupted',
+                    'updated_at': datetime.utcnow()
+                },
+                '$unset': {'active': ''}
+            }
+        )
+        logger.warning(f"Import job {active_job['_id']} for video {video_id} went stale")
+        return None
+
+    def get_job(self, job_id, user_id):
+        """Get a job owned by the user"""
+        try:
+            return self.collection.find_one({'_id': ObjectId(job_id), 'user_id': user_id})
+        except Exception:
+            return None
+
+    def _update(self, job_id, **fields):
+        fields['updated_at'] = datetime.utcnow()
+        self.collection.update_one({'_id': job_id, 'active': True}, {'$set': fields})
+
+    def _finish(self, job_id, **fields):
+        """Record the final state of a job and release its active slot"""
+        fields['updated_at'] = datetime.utcnow()
+        self.collection.update_one({'_id': job_id}, {'$set': fields, '$unset': {'active': ''}})
+
+    def _heartbeat(self, job_id, stopped):
+        """Refresh updated_at until the job finishes, so it is not taken for stale"""
+        while not stopped.wait(self.heartbeat_interval):
+            try:
+                self.collection.update_one(
+                    {'_id': job_id, 'active': True},
+                    {'$set': {'updated_at': datetime.utcnow()}}
+                )
+            except Exception as e:
+                logger.error(f"Heartbeat of import job {job_id} failed: {str(e)}")
+
+    def _run_import(self, job_id, user_id, video_id, title):
+        """Execute an import job on a worker thread"""
+        stopped = threading.Event()
+        threading.Thread(
+            target=self._heartbeat,
+            args=(job_id, stopped),
+            name=f'transcript-import-heartbeat-{job_id}',
+            daemon=True
+        ).start()
+        try:
+            saved_transcript = transcript_service.import_video(
+                user_id=user_id,
+                video_id=video_id,
+                title=title,
+                on_progress=lambda stage, percent: self._update(job_id, status=stage, progress=percent)
+            )
+            self._finish(job_id, status='completed', progress=100, result=saved_transcript)
+            logger.info(f"Import job {job_id} completed for video {video_id}")
+        except Exception as e:
+            logger.error(f"Import job {job_id} failed: {str(e)}")
+            logger.error(f"Full traceback: {traceback.format_exc()}")
+            self._finish(job_id, status='failed', error=str(e))
+        finally:
+            stopped.set()
+
+    @staticmethod
+    def serialize(job):
+        """Convert a job document to an API response"""
+        return {
+            'job_id': str(job['_id']),
+            'video_id': job['video_id'],
+            'status': job['status'],
+            'progress': job.get('progress', 0),
+            'result': job.get('result'),
+            'error': job.get('error'),
+            'created_at': job.get('created_at'),
+            'updated_at': job.get('updated_at')
+        }
+
+
+# Create singleton instance
+import_job_service = ImportJobService()
@@ -0,0 +1,100 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+
+def estimate_size(value):
+    """Approximate memory footprint of a JSON-like value in bytes"""
+    try:
+        return len(json.dumps(value, ensure_ascii=False, default=str).encode('utf-8')) + 64
+    except (TypeError, ValueError):
+        return 1024
+
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache bounded by approximate memory use.
+
+    Entries are evicted least recently used first once the summed entry
+    sizes exceed `max_bytes`, and an entry may carry its own expiry time.
+    Each worker process has its own copy, so keep a TTL on anything that
+    another process can change.
+    """
+
+    def __init__(self, max_bytes, ttl=None, sizeof=estimate_size):
+        """
+        Args:
+            max_bytes (int): Memory budget for all entries
+            ttl (float): Default seconds an entry stays valid, None for no expiry
+            sizeof (callable): Estimates the size of a key and value in bytes
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            value, size, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                self._remove(key)
+                self.misses += 1
+                return default
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None, expires_at=None):
+        """
+        Store a value
+        Args:
+            ttl (float): Seconds the entry stays valid, defaults to the cache TTL
+            expires_at (float): Absolute expiry as a Unix timestamp, overrides ttl
+        """
+        if expires_at is None:
+            ttl = self.ttl if ttl is None else ttl
+            expires_at = time.time() + ttl if ttl is not None else None
+        size = self._sizeof(key) + self._sizeof(value)
+        if size > self.max_bytes:
+            return
+
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (value, size, expires_at)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def delete(self, key):
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses
+            }
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
@@ -0,0 +1,109 @@
+import os
+import certifi
+from pymongo import MongoClient, ReadPreference
+from dotenv import load_dotenv
+from urllib.parse import quote_plus
+
+# Load environment variables
+load_dotenv()
+
+# Read preferences accepted by MONGODB_*_READ_PREFERENCE settings
+READ_PREFERENCES = {
+    'primary': ReadPreference.PRIMARY,
+    'primaryPreferred': ReadPreference.PRIMARY_PREFERRED,
+    'secondary': ReadPreference.SECONDARY,
+    'secondaryPreferred': ReadPreference.SECONDARY_PREFERRED,
+    'nearest': ReadPreference.NEAREST,
+}
+
+
+def _env_int(name, default):
+    value = os.getenv(name)
+    return int(value) if value not in (None, '') else default
+
+
+def available_compressors(requested):
+    """Keep only the wire compressors whose Python package is installed"""
+    available = []
+    for name in requested:
+        if name == 'zstd':
+            try:
+                import zstandard  # noqa: F401
+            except ImportError:
+                continue
+        elif name == 'snappy':
+            try:
+                import snappy  # noqa: F401
+            except ImportError:
+                continue
+        elif name != 'zlib':
+            continue
+        available.append(name)
+    return available
+
+
+def resolve_uri(uri=None):
+    """Get the MongoDB URI, URL-encoding a password written as <password>"""
+    uri = uri or os.getenv('MONGODB_URI')
+    if not uri:
+        raise ValueError("MONGODB_URI environment variable is not set")
+
+    # Handle URL encoding of username and password if needed
+    if '<' in uri and '>' in uri:
+        start = uri.find(':<') + 2
+        end = uri.find('>', start)
+        if start > 1 and end > start:
+            password = uri[start:end]
+            uri = uri.replace(f'<{password}>', quote_plus(password))
+    return uri
+
+
+def get_database_name():
+    return os.getenv('MONGODB_NAME', 'hindi_qa_db')
+
+
+def read_preference(workload):
+    """
+    Read preference for a workload, from MONGODB_<WORKLOAD>_READ_PREFERENCE
+    (practice reads default to secondaryPreferred, everything else to primary)
+    """
+    default = 'secondaryPreferred' if workload == 'practice' else 'primary'
+    name = os.getenv(f'MONGODB_{workload.upper()}_READ_PREFERENCE', default)
+    if name not in READ_PREFERENCES:
+        raise ValueError(f"Unknown read preference '{name}' for {workload} reads")
+    return READ_PREFERENCES[name]
+
+
+def create_mongo_client(uri=None, tls_ca=True, **overrides):
+    """
+    Create a MongoClient configured from the environment. The web app and
+    every script should connect through this factory.
+    Args:
+        uri (str): Connection string, defaults to MONGODB_URI
+        tls_ca (bool): Verify TLS with certifi's CA bundle (disable for a local server)
+        overrides: Any MongoClient option, taking precedence over the environment
+    Returns:
+        MongoClient: The configured client (connections are opened lazily)
+    """
+    options = {
+        'maxPoolSize': _env_int('MONGODB_MAX_POOL_SIZE', 50),
+        'minPoolSize': _env_int('MONGODB_MIN_POOL_SIZE', 0),
+        'maxIdleTimeMS': _env_int('MONGODB_MAX_IDLE_TIME_MS', 300000),
+        'connectTimeoutMS': _env_int('MONGODB_CONNECT_TIMEOUT_MS', 10000),
+        'serverSelectionTimeoutMS': _env_int('MONGODB_SERVER_SELECTION_TIMEOUT_MS', 10000),
+        'socketTimeoutMS': _env_int('MONGODB_SOCKET_TIMEOUT_MS', None),
+        'retryWrites': os.getenv('MONGODB_RETRY_WRITES', 'True') == 'True',
+        'retryReads': os.getenv('MONGODB_RETRY_READS', 'True') == 'True',
+        'appname': os.getenv('MONGODB_APP_NAME', 'hindisetu'),
+    }
+    # Transcript and vocabulary documents are large text; compress them on the wire
+    compressors = available_compressors(
+        os.getenv('MONGODB_COMPRESSORS', 'zstd,snappy,zlib').split(',')
+    )
+    if compressors:
+        options['compressors'] = ','.join(compressors)
+    if tls_ca:
+        options['tlsCAFile'] = certifi.where()
+    options.update(overrides)
+
+    return MongoClient(resolve_uri(uri), **options)
@@ -1,18 +1,127 @@
 import os
-import certifi
-from pymongo import MongoClient
+import threading
+from pymongo import IndexModel, ReturnDocument, UpdateOne, ASCENDING, DESCENDING
+from pymongo.errors import DuplicateKeyError, OperationFailure
 from dotenv import load_dotenv
-from datetime import datetime
-from urllib.parse import quote_plus
+from datetime import datetime, timedelta
 from bson import ObjectId
+from .mongo_client import create_mongo_client, get_database_name, read_preference
 
 # Load environment variables
 load_dotenv()
 
+# Declarative index registry: every index the application relies on, per collection.
+# `python manage.py ensure_indexes` creates or reconciles these.
+INDEXES = {
+    'users': [
+        IndexModel([('email', ASCENDING)], unique=True),
+        IndexModel([('username', ASCENDING)], unique=True),
+    ],
+    'transcripts': [
+        IndexModel([('user_id', ASCENDING), ('video_id', ASCENDING)]),
+        # Equality on user/favorite, then _id order for cursor pagination
+        IndexModel([('user_id', ASCENDING), ('_id', ASCENDING)]),
+        IndexModel([('user_id', ASCENDING), ('is_favorite', ASCENDING), ('_id', ASCENDING)]),
+    ],
+    'qa_pairs': [
+        IndexModel([('transcript_id', ASCENDING), ('_id', ASCENDING)]),
+        IndexModel([('video_id', ASCENDING), ('type', ASCENDING)]),
+    ],
+    'user_words': [
+        IndexModel([('user_id', ASCENDING), ('word_id', ASCENDING)], unique=True),
+        IndexModel([('user_id', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)]),
+        IndexModel([('user_id', ASCENDING), ('is_favorite', ASCENDING), ('created_at', DESCENDING), ('_id', DESCENDING)]),
+    ],
+    'user_progress': [
+        IndexModel([('user_id', ASCENDING), ('video_id', ASCENDING), ('type', ASCENDING)], unique=True),
+    ],
+    'user_answers': [
+        IndexModel([('user_id', ASCENDING), ('answered_at', DESCENDING)]),
+        IndexModel([('user_id', ASCENDING), ('question_id', ASCENDING), ('answered_at', DESCENDING)]),
+    ],
+    'global_words': [
+        # Lookup key from vocabulary_service.normalize_word; run backfill_normalized_words first
+        IndexModel(
+            [('normalized_word', ASCENDING)],
+            unique=True,
+            partialFilterExpression={'normalized_word': {'$type': 'string'}}
+        ),
+        IndexModel([('frequency', DESCENDING)]),
+    ],
+    'word_frequency_buckets': [
+        IndexModel([('bucket', ASCENDING), ('word_id', ASCENDING)], unique=True),
+        # Hourly counters are removed once older than the longest trending window
+        IndexModel([('expires_at', ASCENDING)], expireAfterSeconds=0),
+    ],
+    'processed_videos': [
+        IndexModel([('video_id', ASCENDING), ('language', ASCENDING)], unique=True),
+    ],
+    'leases': [
+        # Abandoned leases are cleaned up an hour after they expire
+        IndexModel([('expires_at', ASCENDING)], expireAfterSeconds=3600),
+    ],
+    'raw_transcripts': [
+        IndexModel([('video_id', ASCENDING), ('language', ASCENDING)], unique=True),
+    ],
+    'cache_entries': [
+        # Shared Django cache (api.cache_backends.MongoCache); entries are removed once expired
+        IndexModel([('expires_at', ASCENDING)], expireAfterSeconds=0),
+    ],
+    'token_blacklist': [
+        # Blacklisted refresh tokens are removed once the token itself has expired
+        IndexModel([('expires_at', ASCENDING)], expireAfterSeconds=0),
+    ],
+    'import_jobs': [
+        # At most one active import per user and video
+        IndexModel(
+            [('user_id', ASCENDING), ('video_id', ASCENDING)],
+            unique=True,
+            partialFilterExpression={'active': True}
+        ),
+    ],
+}
+
+# Representative hot queries, checked with explain() for collection scans
+QUERY_SHAPES = [
+    ('transcripts', {'user_id': '', 'video_id': ''}),
+    ('transcripts', {'user_id': '', 'is_favorite': True}),
+    ('qa_pairs', {'transcript_id': ''}),
+    ('qa_pairs', {'video_id': '', 'type': ''}),
+    ('user_words', {'user_id': '', 'word_id': None}),
+    ('user_progress', {'user_id': '', 'video_id': '', 'type': ''}),
+    ('global_words', {'normalized_word': ''}),
+    ('processed_videos', {'video_id': '', 'language': ''}),
+]
+
+# A practice summary insert still pending after this long is taken as abandoned
+PRACTICE_SUMMARY_PENDING_TIMEOUT = timedelta(minutes=10)
+
+# Index options that must match for an existing index to be considered current
+INDEX_OPTIONS = ('unique', 'sparse', 'expireAfterSeconds', 'partialFilterExpression')
+
+# Projections per use case, so the large transcript text (`content`,
+# `translation`, `vocabulary`, `processed_content`) is only read when rendered
+TRANSCRIPT_SUMMARY_PROJECTION = {'content': 0, 'translation': 0, 'vocabulary': 0, 'processed_content': 0}
+TRANSCRIPT_GENERATION_PROJECTION = {'content': 1, 'video_id': 1, 'title': 1, 'user_id': 1}
+TRANSCRIPT_PROCESSING_PROJECTION = {'content': 1, 'processed_content': 1}
+TRANSCRIPT_PRACTICE_PROJECTION = {'content': 1, 'title': 1}
+QUESTION_PROJECTION = {
+    'transcript_id': 1, 'video_id': 1, 'video_title': 1, 'question_text': 1, 'answer': 1,
+    'type': 1, 'options': 1, 'created_at': 1, 'attempts': 1, 'correct_attempts': 1, 'is_favorite': 1
+}
+QUESTION_PRACTICE_PROJECTION = {
+    'question_text': 1, 'answer': 1, 'type': 1, 'options': 1, 'video_title': 1,
+    'attempts': 1, 'correct_attempts': 1
+}
+WORD_LIST_PROJECTION = {'word': 1, 'meaning_data.meaning': 1, 'meaning_data.example': 1, 'frequency': 1}
+
 class MongoService:
     _instance = None
     _client = None
     _db = None
+    _practice_db = None
+    _pid = None
+    _lock = threading.Lock()
 
     def __new__(cls):
         if cls._instance is None:
@@ -20,60 +129,252 @@ class MongoService:
         return cls._instance
 
     def __init__(self):
-        if self._client is None:
-            self._connect()
+        # The client is created on first use, so importing this module does no network I/O
+        pass
 
     def _connect(self):
         """Connect to MongoDB"""
         try:
-            uri = os.getenv('MONGODB_URI')
-            db_name = os.getenv('MONGODB_NAME', 'hindi_qa_db')
-            
-            if not uri:
-                raise ValueError("MONGODB_URI environment variable is not set")
-
-            # Handle URL encoding of username and password if needed
-            if '<' in uri and '>' in uri:
-                # Extract and encode password
-                start = uri.find(':<') + 2
-                end = uri.find('>', start)
-                if start > 1 and end > start:
-                    password = uri[start:end]
-                    encoded_password = quote_plus(password)
-                    uri = uri.replace(f'<{password}>', encoded_password)
-            
-            # Connect with SSL certificate verification
-            self._client = MongoClient(
-                uri,
-                tlsCAFile=certifi.where()
-            )
-            self._db = self._client[db_name]
+            # Pool sizing, timeouts, compression and TLS come from the shared factory
+            self._client = create_mongo_client()
+            self._db = self._client[get_database_name()]
+            self._practice_db = self._db.with_options(read_preference=read_preference('practice'))
+            self._pid = os.getpid()
             print(f"Connected to MongoDB Atlas")
         except Exception as e:
             print(f"Error connecting to MongoDB: {str(e)}")
             raise
 
+    @property
+    def client(self):
+        """
+        Get the MongoClient, creating it on first use. A forked worker gets
+        its own client, since PyMongo clients must not be shared across fork.
+        """
+        if self._client is None or self._pid != os.getpid():
+            with self._lock:
+                if self._client is None or self._pid != os.getpid():
+                    self._connect()
+        return self._client
+
     @property
     def db(self):
         """Get database instance"""
+        self.client  # Connects on first use and after fork
         return self._db
 
+    @property
+    def practice_db(self):
+        """Database handle for practice reads, which tolerate replica lag (secondaryPreferred by default)"""
+        self.client
+        return self._practice_db
+
+    def warm_up(self):
+        """Connect and complete a round trip before the first request needs it"""
+        self.db.command('ping')
+
+    def ensure_indexes(self, collections=None, prune=False):
+        """
+        Create or reconcile the indexes declared in INDEXES
+        Args:
+            collections (list): Collection names to reconcile, defaults to all
+            prune (bool): Drop indexes that are not declared in the registry
+        Returns:
+            dict: Per-collection report of created, rebuilt, dropped, extra and failed indexes
+        """
+        report = {}
+        for name in collections or INDEXES:
+            collection = self.db[name]
+            existing = collection.index_information()
+            result = {'created': [], 'rebuilt': [], 'dropped': [], 'extra': [], 'errors': []}
+
+            declared = {}
+            for index in INDEXES.get(name, []):
+                spec = index.document
+                declared[spec['name']] = spec
+                current = existing.get(spec['name'])
+                try:
+                    if current is None:
+                        collection.create_indexes([index])
+                        result['created'].append(spec['name'])
+                    elif self._index_differs(current, spec):
+                        collection.drop_index(spec['name'])
+                        collection.create_indexes([index])
+                        result['rebuilt'].append(spec['name'])
+                except OperationFailure as e:
+                    # e.g. a unique index over data that still holds duplicates
+                    result['errors'].append(f"{spec['name']}: {str(e)}")
+
+            for index_name in existing:
+                if index_name == '_id_' or index_name in declared:
+                    continue
+                if prune:
+                    collection.drop_index(index_name)
+                    result['dropped'].append(index_name)
+                else:
+                    result['extra'].append(index_name)
+
+            report[name] = result
+        return report
+
+    @staticmethod
+    def _index_differs(current, spec):
+        """Compare an index from index_information() with a declared IndexModel document"""
+        if list(current['key']) != list(spec['key'].items()):
+            return True
+        return any(current.get(option) != spec.get(option) for option in INDEX_OPTIONS)
+
+    def find_collection_scans(self):
+        """
+        Explain the representative queries in QUERY_SHAPES
+        Returns:
+            list: (collection, filter) pairs whose winning plan is a collection scan
+        """
+        def has_collscan(plan):
+            if not isinstance(plan, dict):
+                return False
+            if plan.get('stage') == 'COLLSCAN':
+                return True
+            children = [plan.get('inputStage'), plan.get('queryPlan')] + plan.get('inputStages', [])
+            return any(has_collscan(child) for child in children)
+
+        flagged = []
+        for name, query in QUERY_SHAPES:
+            explanation = self.db[name].find(query).explain()
+            winning_plan = explanation.get('queryPlanner', {}).get('winningPlan', {})
+            if has_collscan(winning_plan):
+                flagged.append((name, query))
+        return flagged
+
     def save_qa_pair(self, transcript_id, qa_data):
         """Save QA pair to MongoDB"""
-        collection = self._db.qa_pairs
+        collection = self.db.qa_pairs
         qa_data['transcript_id'] = transcript_id
         return collection.insert_one(qa_data)
 
     def get_qa_pairs(self, transcript_id=None):
         """Get QA pairs, optionally filtered by transcript_id"""
-        collection = self._db.qa_pairs
+        collection = self.db.qa_pairs
         query = {'transcript_id': transcript_id} if transcript_id else {}
         return list(collection.find(query))
 
-    def save_transcript(self, user_id, video_id, content, language='hi', translation=None, vocabulary=None):
+    def count_questions_by_transcript(self, transcript_ids):
+        """
+        Count questions per type for many transcripts in one query
+        Returns:
+            dict: transcript_id -> {type: count}
+        """
+        counts = {transcript_id: {} for transcript_id in transcript_ids}
+        if not transcript_ids:
+            return counts
+        pipeline = [
+            {'$match': {'transcript_id': {'$in': list(transcript_ids)}}},
+            {'$group': {
+                '_id': {'transcript_id': '$transcript_id', 'type': {'$ifNull': ['$type', 'novice']}},
+                'count': {'$sum': 1}
+            }}
+        ]
+        for row in self.db.qa_pairs.aggregate(pipeline):
+            counts.setdefault(row['_id']['transcript_id'], {})[row['_id']['type']] = row['count']
+        return counts
+
+    def get_questions_by_transcript(self, transcript_ids):
+        """
+        Get the questions of many transcripts in one query
+        Returns:
+            dict: transcript_id -> list of questions with string ids
+        """
+        questions = {transcript_id: [] for transcript_id in transcript_ids}
+        if not transcript_ids:
+            return questions
+        cursor = self.db.qa_pairs.find({'transcript_id': {'$in': list(transcript_ids)}}, QUESTION_PROJECTION)
+        for question in cursor:
+            question['_id'] = str(question['_id'])
+            questions.setdefault(question['transcript_id'], []).append(question)
+        return questions
+
+    def get_questions(self, transcript_id, paginator=None):
+        """
+        Get the questions of a transcript, optionally one keyset page
+        Args:
+            transcript_id (str): Transcript ID
+            paginator (MongoCursorPagination): Pagination of the request, if enabled
+        Returns:
+            list: Questions with string ids (one extra when paginated, see paginate())
+        """
+        query = {'transcript_id': transcript_id}
+        if paginator:
+            cursor = self.db.qa_pairs.find(paginator.filter(query), QUESTION_PROJECTION)
+            cursor = cursor.sort(paginator.sort).limit(paginator.page_size + 1)
+        else:
+            cursor = self.db.qa_pairs.find(query, QUESTION_PROJECTION)
+        questions = list(cursor)
+        for question in questions:
+            question['_id'] = str(question['_id'])
+        return questions
+
+    def get_question(self, transcript_id, question_id):
+        """Get one question of a transcript, or None"""
+        question = self.db.qa_pairs.find_one(
+            {'_id': ObjectId(question_id), 'transcript_id': transcript_id},
+            QUESTION_PROJECTION
+        )
+        if question:
+            question['_id'] = str(question['_id'])
+        return question
+
+    def get_practice_questions(self, video_id, question_type):
+        """Get the questions of a practice set with only the fields the practice page shows"""
+        return list(self.practice_db.qa_pairs.find(
+            {'video_id': video_id, 'type': question_type},
+            QUESTION_PRACTICE_PROJECTION
+        ))
+
+    def insert_questions(self, questions):
+        """
+        Insert generated questions with one insert_many
+        Returns:
+            list: The inserted ObjectIds, in order
+        """
+        if not questions:
+            return []
+        return self.db.qa_pairs.insert_many(questions).inserted_ids
+
+    def get_processed_video(self, video_id, language=None):
+        """Get the shared processed transcript for a video, preferring Hindi"""
+        collection = self.db.processed_videos
+        if language:
+            return collection.find_one({'video_id': video_id, 'language': language})
+        processed = list(collection.find({'video_id': video_id}))
+        if not processed:
+            return None
+        processed.sort(key=lambda doc: doc.get('language') != 'hi')
+        return processed[0]
+
+    def save_processed_video(self, video_id, language, processed_data):
+        """Store the processed transcript for a video once, shared by all users"""
+        collection = self.db.processed_videos
+        collection.update_one(
+            {'video_id': video_id, 'language': language},
+            {
+                '$setOnInsert': {
+                    'video_id': video_id,
+                    'language': language,
+                    'punctuated_text': processed_data['punctuated_text'],
+                    'translation': processed_data['translation'],
+                    'vocabulary': processed_data['vocabulary'],
+                    'created_at': datetime.utcnow()
+                }
+            },
+            upsert=True
+        )
+        return collection.find_one({'video_id': video_id, 'language': language})
+
+    def save_transcript(self, user_id, video_id, content, language='hi', translation=None, vocabulary=None,
+                        processed_video_id=None):
         """Save transcript to MongoDB"""
         try:
-            collection = self._db.transcripts
+            collection = self.db.transcripts
             data = {
                 'user_id': user_id,
                 'video_id': video_id,
@@ -83,7 +384,8 @@ class MongoService:
                 'updated_at': datetime.utcnow(),
                 'is_favorite': False,
                 'translation': translation,
-                'vocabulary': vocabulary
+                'vocabulary': vocabulary,
+                'processed_video_id': processed_video_id
             }
             result = collection.insert_one(data)
             print(f"Successfully saved transcript to MongoDB with ID: {result.inserted_id}")
@@ -95,7 +397,7 @@ class MongoService:
     def get_transcripts(self, user_id=None):
         """Get transcripts, optionally filtered by user_id"""
         try:
-            collection = self._db.transcripts
+            collection = self.db.transcripts
             query = {'user_id': user_id} if user_id else {}
             transcripts = list(collection.find(query))
             
@@ -108,14 +410,59 @@ class MongoService:
             print(f"Error getting transcripts from MongoDB: {str(e)}")
             raise
 
-    def get_transcript_by_user_and_video(self, user_id, video_id):
+    def get_user_transcripts(self, user_id, favorites_only=False, projection=None, paginator=None):
+        """
+        Get a user's transcripts, optionally one keyset page
+        Args:
+            user_id (str): Owner of the transcripts
+            favorites_only (bool): Only return favorite transcripts
+            projection (dict): Fields to read, e.g. TRANSCRIPT_SUMMARY_PROJECTION
+            paginator (MongoCursorPagination): Pagination of the request, if enabled
+        Returns:
+            list: Transcripts with an `id` string field
+        """
+        query = {'user_id': user_id}
+        if favorites_only:
+            query['is_favorite'] = True
+        if paginator:
+            cursor = self.db.transcripts.find(paginator.filter(query), projection)
+            cursor = cursor.sort(paginator.sort).limit(paginator.page_size + 1)
+        else:
+            cursor = self.db.transcripts.find(query, projection)
+        transcripts = list(cursor)
+        for transcript in transcripts:
+            transcript['id'] = str(transcript['_id'])
+        return transcripts
+
+    def get_user_transcript(self, user_id, key, projection=None):
+        """
+        Get a user's transcript by video ID, or by transcript ID for older clients
+        Args:
+            user_id (str): Owner of the transcript
+            key (str): Video ID or transcript ID
+            projection (dict): Fields to read
+        Returns:
+            dict: The transcript with an `id` string field, or None
+        """
+        transcript = self.db.transcripts.find_one({'video_id': key, 'user_id': user_id}, projection)
+        if not transcript and ObjectId.is_valid(key):
+            transcript = self.db.transcripts.find_one({'_id': ObjectId(key), 'user_id': user_id}, projection)
+        if transcript:
+            transcript['id'] = str(transcript['_id'])
+        return transcript
+
+    def get_transcript(self, transcript_id, projection=None):
+        """Get a transcript by ID, reading only the projected fields"""
+        return self.db.transcripts.find_one({'_id': ObjectId(transcript_id)}, projection)
+
+    def get_transcript_by_user_and_video(self, user_id, video_id, projection=None):
         """Get transcript by user_id and video_id"""
         try:
-            collection = self._db.transcripts
+            collection = self.db.transcripts
             transcript = collection.find_one({
                 'user_id': user_id,
                 'video_id': video_id
-            })
+            }, projection)
             if transcript:
                 transcript['id'] = str(transcript['_id'])
             return transcript
@@ -123,60 +470,359 @@ class MongoService:
             print(f"Error getting transcript from MongoDB: {str(e)}")
             raise
 
+    def get_practice_transcript(self, user_id, video_id):
+        """Get the title and text of a user's transcript for the practice page"""
+        return self.practice_db.transcripts.find_one(
+            {'user_id': user_id, 'video_id': video_id},
+            TRANSCRIPT_PRACTICE_PROJECTION
+        )
+
+    def set_processed_content(self, transcript_id, processed_data):
+        """Store the punctuated text, translation and vocabulary of a transcript"""
+        self.db.transcripts.update_one(
+            {'_id': ObjectId(transcript_id)},
+            {
+                '$set': {
+                    'processed_content': processed_data,
+                    'updated_at': datetime.utcnow()
+                }
+            }
+        )
+
     def toggle_transcript_favorite(self, transcript_id, user_id):
         """Toggle favorite status of a transcript"""
         try:
-            collection = self._db.transcripts
-            transcript = collection.find_one({
-                '_id': ObjectId(transcript_id),
-                'user_id': user_id
-            })
-            
+            # Flip the flag server-side and read back only the flag
+            transcript = self.db.transcripts.find_one_and_update(
+                {'_id': ObjectId(transcript_id), 'user_id': user_id},
+                [{'$set': {
+                    'is_favorite': {'$not': [{'$ifNull': ['$is_favorite', False]}]},
+                    'updated_at': datetime.utcnow()
+                }}],
+                projection={'is_favorite': 1},
+                return_document=ReturnDocument.AFTER
+            )
             if not transcript:
                 return None
-                
-            # Toggle the is_favorite field
-            is_favorite = not transcript.get('is_favorite', False)
-            collection.update_one(
-                {'_id': ObjectId(transcript_id)},
-                {
-                    '$set': {
-                        'is_favorite': is_favorite,
-                        'updated_at': datetime.utcnow()
-                    }
-                }
-            )
-            
-            # Return updated transcript
-            transcript['is_favorite'] = is_favorite
             transcript['id'] = str(transcript['_id'])
             return transcript
         except Exception as e:
             print(f"Error toggling favorite in MongoDB: {str(e)}")
             raise
 
+    def aggregate_practice_sets(self, user_id, primary=False):
+        """
+        Count a user's questions per transcript and type with one aggregation
+        Args:
+            user_id (str): Owner of the transcripts
+            primary (bool): Read from the primary; required when the result is persisted,
+                since a lagging secondary may miss recent questions
+        Returns:
+            list: Practice set entries with id, title, video_id, type and question_count
+        """
+        pipeline = [
+            {'$match': {'user_id': user_id}},
+            {'$project': {
+                'title': 1,
+                'video_id': 1,
+                'transcript_id': {'$toString': '$_id'}
+            }},
+            {'$lookup': {
+                'from': 'qa_pairs',
+                'let': {'transcript_id': '$transcript_id'},
+                'pipeline': [
+                    {'$match': {'$expr': {'$eq': ['$transcript_id', '$$transcript_id']}}},
+                    {'$group': {
+                        '_id': {'$ifNull': ['$type', 'novice']},  # Default to novice if type not specified
+                        'count': {'$sum': 1}
+                    }}
+                ],
+                'as': 'type_counts'
+            }},
+            {'$unwind': '$type_counts'},
+            {'$project': {
+                '_id': 0,
+                'id': '$transcript_id',
+                'title': {'$ifNull': ['$title', 'Untitled']},
+                'video_id': 1,
+                'type': '$type_counts._id',
+                'question_count': '$type_counts.count'
+            }}
+        ]
+        db = self.db if primary else self.practice_db
+        return list(db.transcripts.aggregate(pipeline))
+
+    def get_practice_summary(self, user_id):
+        """Get the precomputed practice sets of a user, or None if not built yet"""
+        # Read on the primary: a summary missing from a lagging secondary would be rebuilt needlessly
+        summary = self.db.practice_summaries.find_one({'_id': user_id})
+        if summary is None or not summary.get('built'):
+            return None
+
+        practice_sets = []
+        for transcript_id, entry in summary.get('sets', {}).items():
+            for q_type, count in entry.get('counts', {}).items():
+                if count > 0:
+                    practice_sets.append({
+                        'id': transcript_id,
+                        'title': entry.get('title', 'Untitled'),
+                        'video_id': entry['video_id'],
+                        'type': q_type,
+                        'question_count': count
+                    })
+        return practice_sets
+
+    def rebuild_practice_summary(self, user_id):
+        """
+        Recount a user's practice sets and store them as the practice summary.
+
+        Every change to the summary bumps its `version`. The rebuild is only
+        stored if the version is unchanged since before the recount, so an
+        increment or removal racing with it is never overwritten; the summary
+        then stays unbuilt and the next read recounts again. Nor is it stored
+        while questions are being inserted (`pending`), since the recount may
+        already include questions whose increment has not been applied yet.
+        Returns:
+            list: The recounted practice set entries
+        """
+        current = self.db.practice_summaries.find_one(
+            {'_id': user_id}, {'version': 1, 'pending': 1, 'pending_at': 1}
+        )
+        practice_sets = self.aggregate_practice_sets(user_id, primary=True)
+
+        if current and current.get('pending', 0) > 0 and \
+                current.get('pending_at', datetime.min) > datetime.utcnow() - PRACTICE_SUMMARY_PENDING_TIMEOUT:
+            return practice_sets
+
+        document = {
+            '_id': user_id,
+            'sets': self._summary_sets(practice_sets),
+            'built': True,
+            'version': current.get('version', 0) if current else 0,
+            'pending': 0,
+            'updated_at': datetime.utcnow()
+        }
+        if current is None:
+            try:
+                self.db.practice_summaries.insert_one(document)
+            except DuplicateKeyError:
+                pass  # Changed while recounting
+        else:
+            self.db.practice_summaries.replace_one(
+                {'_id': user_id, 'version': current.get('version')},
+                document
+            )
+        return practice_sets
+
+    @staticmethod
+    def _summary_sets(practice_sets):
+        """Group practice set entries into the summary's sets map"""
+        sets = {}
+        for entry in practice_sets:
+            summary_entry = sets.setdefault(entry['id'], {
+                'title': entry['title'],
+                'video_id': entry['video_id'],
+                'counts': {}
+            })
+            summary_entry['counts'][entry['type']] = entry['question_count']
+        return sets
+
+    def begin_practice_summary_update(self, user_id):
+        """
+        Mark questions as being inserted for a user, before the insert. Call
+        increment_practice_summary once the insert finished, with counts=None
+        if it failed.
+        """
+        now = datetime.utcnow()
+        self.db.practice_summaries.update_one(
+            {'_id': user_id},
+            {'$inc': {'version': 1, 'pending': 1}, '$set': {'pending_at': now, 'updated_at': now}},
+            upsert=True
+        )
+
+    def increment_practice_summary(self, user_id, transcript, counts):
+        """
+        Add newly inserted question counts (type -> count) to the practice
+        summary and end the pending insert. With counts=None (the insert
+        failed, possibly part way) the summary is marked for a recount.
+        """
+        if counts is None:
+            self.db.practice_summaries.update_one(
+                {'_id': user_id},
+                {
+                    '$inc': {'version': 1, 'pending': -1},
+                    '$unset': {'built': ''},
+                    '$set': {'updated_at': datetime.utcnow()}
+                }
+            )
+            return
+
+        transcript_id = str(transcript['_id'])
+        increments = {f'sets.{transcript_id}.counts.{q_type}': count for q_type, count in counts.items()}
+        increments['version'] = 1
+        increments['pending'] = -1
+        update = {
+            '$inc': increments,
+            '$set': {
+                f'sets.{transcript_id}.title': transcript.get('title', 'Untitled'),
+                f'sets.{transcript_id}.video_id': transcript['video_id'],
+                'updated_at': datetime.utcnow()
+            }
+        }
+        # The upsert leaves an unbuilt summary that the next read recounts,
+        # and makes a rebuild already in progress discard its recount
+        self.db.practice_summaries.update_one({'_id': user_id}, update, upsert=True)
+
+    def remove_from_practice_summary(self, user_id, transcript_id):
+        """Drop a deleted transcript from the practice summary"""
+        self.db.practice_summaries.update_one(
+            {'_id': user_id},
+            {
+                '$unset': {f'sets.{transcript_id}': ''},
+                '$inc': {'version': 1},
+                '$set': {'updated_at': datetime.utcnow()}
+            },
+            upsert=True
+        )
+
     def delete_transcript(self, transcript_id, user_id):
         """Delete a transcript and its associated questions from MongoDB"""
         try:
-            # First verify the transcript exists and belongs to the user
-            transcript = self._db.transcripts.find_one({
+            # Delete the transcript only if it belongs to the user
+            result = self.db.transcripts.delete_one({
                 '_id': ObjectId(transcript_id),
                 'user_id': user_id
             })
             
-            if not transcript:
+            if not result.deleted_count:
                 return False
-                
-            # Delete the transcript
-            self._db.transcripts.delete_one({'_id': ObjectId(transcript_id)})
             
             # Delete associated questions
-            self._db.qa_pairs.delete_many({'transcript_id': transcript_id})
+            self.db.qa_pairs.delete_many({'transcript_id': transcript_id})
             
             return True
         except Exception as e:
             print(f"Error deleting transcript from MongoDB: {str(e)}")
             raise
 
+    def add_user_words(self, user_id, word_ids):
+        """Add dictionary words to a user's list with one bulk upsert; existing entries are kept"""
+        operations = [
+            UpdateOne(
+                {'user_id': user_id, 'word_id': word_id},
+                {
+                    '$setOnInsert': {
+                        'is_mastered': False,
+                        'is_favorite': False,
+                        'notes': '',
+                        'created_at': datetime.now()
+                    }
+                },
+                upsert=True
+            )
+            for word_id in word_ids
+        ]
+        if operations:
+            self.db.user_words.bulk_write(operations, ordered=False)
+
+    def toggle_user_word_favorite(self, user_id, word_id):
+        """
+        Toggle the favorite flag of a word in a user's list
+        Returns:
+            bool: The new favorite status, or None if the word is not in the list
+        """
+        user_word = self.db.user_words.find_one_and_update(
+            {'user_id': user_id, 'word_id': ObjectId(word_id)},
+            [{'$set': {
+                'is_favorite': {'$not': [{'$ifNull': ['$is_favorite', False]}]},
+                'updated_at': datetime.now()
+            }}],
+            projection={'_id': 0, 'is_favorite': 1},
+            return_document=ReturnDocument.AFTER
+        )
+        return user_word['is_favorite'] if user_word else None
+
+    def update_user_word_notes(self, user_id, word_id, notes):
+        """
+        Set the notes of a word in a user's list
+        Returns:
+            bool: False if the word is not in the list
+        """
+        result = self.db.user_words.update_one(
+            {'user_id': user_id, 'word_id': ObjectId(word_id)},
+            {'$set': {'notes': notes, 'updated_at': datetime.now()}}
+        )
+        return result.matched_count > 0
+
+    def get_user_words(self, user_id, favorites_only=False, paginator=None):
+        """
+        Get a user's words joined with their dictionary entries, newest first
+        Args:
+            user_id (str): Owner of the list
+            favorites_only (bool): Only return favorite words
+            paginator (MongoCursorPagination): Pagination on created_at, if enabled
+        Returns:
+            tuple: (words shaped for the vocabulary page, next cursor or None)
+        """
+        match_condition = {'user_id': user_id}
+        if favorites_only:
+            match_condition['is_favorite'] = True
+
+        page_stages = []
+        if paginator:
+            match_condition = paginator.filter(match_condition)
+            page_stages = [
+                {'$sort': dict(paginator.sort)},
+                {'$limit': paginator.page_size + 1}
+            ]
+
+        user_words = list(self.db.user_words.aggregate([
+            {'$match': match_condition},
+            *page_stages,
+            {
+                '$lookup': {
+                    'from': 'global_words',
+                    'localField': 'word_id',
+                    'foreignField': '_id',
+                    # Join only the fields the list shows, not sources or the whole meaning
+                    'pipeline': [{'$project': WORD_LIST_PROJECTION}],
+                    'as': 'word_details'
+                }
+            },
+            # Keep entries whose dictionary word was deleted until the page is cut,
+            # so they still count towards page_size when deciding on a next page
+            {'$unwind': {'path': '$word_details', 'preserveNullAndEmptyArrays': True}},
+            {
+                '$project': {
+                    '_id': {'$toString': '$_id'},
+                    'orphaned': {'$not': ['$word_details']},
+                    'word_id': {'$toString': '$word_id'},
+                    'word': '$word_details.word',
+                    'meaning': {
+                        'meaning': '$word_details.meaning_data.meaning',
+                        'example': {
+                            'hindi': '$word_details.meaning_data.example.hindi',
+                            'english': '$word_details.meaning_data.example.english'
+                        }
+                    },
+                    'frequency': {'$ifNull': ['$word_details.frequency', 1]},
+                    'is_mastered': {'$ifNull': ['$is_mastered', False]},
+                    'is_favorite': {'$ifNull': ['$is_favorite', False]},
+                    'notes': {'$ifNull': ['$notes', '']},
+                    # Entries missing created_at (see backfill_user_word_dates) fall back to
+                    # their ObjectId time, which is stable across requests
+                    'created_at': {'$ifNull': ['$created_at', {'$toDate': '$_id'}]}
+                }
+            },
+            # Same order as the keyset sort; the hex _id strings sort like the ObjectIds
+            {'$sort': {'created_at': -1, '_id': -1}}
+        ]))
+
+        next_cursor = None
+        if paginator:
+            user_words, next_cursor = paginator.paginate(user_words)
+        words = [word for word in user_words if not word.pop('orphaned')]
+        return words, next_cursor
+
 # Create singleton instance
 mongo_service = MongoService() 
\ No newline at end of file
@@ -0,0 +1,108 @@
+from datetime import datetime
+from django.conf import settings
+from pymongo import InsertOne, UpdateOne
+from .mongo_service import mongo_service
+from .write_behind import BatchWriter
+
+
+class ProgressService:
+    """
+    Per-user answer history and progress.
+
+    Every answer is appended to the `user_answers` log and folded into one
+    `user_progress` document per (user_id, video_id, type), which keeps the
+    user's attempt counters per question under `answers.<question_id>`.
+    Both writes are queued on a BatchWriter and flushed with bulk_write, so
+    the answer request does not wait on them.
+    """
+
+    def __init__(self):
+        self._writer = None
+
+    @property
+    def writer(self):
+        if self._writer is None:
+            self._writer = BatchWriter(
+                lambda: mongo_service.db,
+                flush_interval=getattr(settings, 'USER_PROGRESS_FLUSH_INTERVAL', 1.0),
+                max_pending=getattr(settings, 'USER_PROGRESS_FLUSH_MAX_PENDING', 200)
+            )
+        return self._writer
+
+    def record_answer(self, user_id, question, submitted_answer, is_correct):
+        """
+        Queue an answer for the user's history and progress
+        Args:
+            user_id (str): User who answered
+            question (dict): qa_pairs document with _id, transcript_id, video_id and type
+            submitted_answer (str): Answer given by the user
+            is_correct (bool): Whether the answer was correct
+        """
+        now = datetime.utcnow()
+        question_id = str(question['_id'])
+        correct = 1 if is_correct else 0
+
+        self.writer.add('user_answers', InsertOne({
+            'user_id': user_id,
+            'question_id': question_id,
+            'transcript_id': question.get('transcript_id'),
+            'video_id': question.get('video_id'),
+            'type': question.get('type'),
+            'answer': submitted_answer,
+            'is_correct': is_correct,
+            'answered_at': now
+        }))
+        self.writer.add('user_progress', UpdateOne(
+            {'user_id': user_id, 'video_id': question.get('video_id'), 'type': question.get('type')},
+            {
+                '$inc': {
+                    'attempts': 1,
+                    'correct_attempts': correct,
+                    f'answers.{question_id}.attempts': 1,
+                    f'answers.{question_id}.correct_attempts': correct
+                },
+                '$set': {
+                    f'answers.{question_id}.last_correct': is_correct,
+                    f'answers.{question_id}.last_answered_at': now,
+                    'updated_at': now
+                }
+            },
+            upsert=True
+        ))
+
+    def get_progress(self, user_id, video_id=None, question_type=None):
+        """
+        Get the user's progress documents, optionally for one video and question type
+        Returns:
+            list: user_progress documents with string IDs
+        """
+        # Make this process's own queued answers visible first
+        self.writer.flush()
+
+        query = {'user_id': user_id}
+        if video_id:
+            query['video_id'] = video_id
+        if question_type:
+            query['type'] = question_type
+
+        progress = list(mongo_service.db.user_progress.find(query))
+        for entry in progress:
+            entry['_id'] = str(entry['_id'])
+        return progress
+
+    def get_question_progress(self, user_id, video_id, question_type):
+        """
+        Get the user's per-question counters for one practice set
+        Returns:
+            dict: question_id -> {attempts, correct_attempts, last_correct, last_answered_at}
+        """
+        self.writer.flush()
+        entry = mongo_service.db.user_progress.find_one(
+            {'user_id': user_id, 'video_id': video_id, 'type': question_type},
+            {'answers': 1}
+        )
+        return entry.get('answers', {}) if entry else {}
+
+
+# Create singleton instance
+progress_service = ProgressService()
@@ -35,6 +35,32 @@ class QAService:
             print(f"Error in QA service: {str(e)}")
             raise ValueError(f"Failed to generate questions: {str(e)}")
 
+    def generate_questions_combined(self, text, question_types):
+        """
+        Generate questions for several types with one model call
+        Args:
+            text (str): The text to generate questions from
+            question_types (list): Types of questions to generate
+        Returns:
+            dict: Mapping of question type to list of question dictionaries
+        """
+        try:
+            return self.qa_model.generate_questions_combined(text, question_types)
+        except Exception as e:
+            print(f"Error in QA service: {str(e)}")
+            raise ValueError(f"Failed to generate questions: {str(e)}")
+
+    def stream_questions(self, text, question_type="novice"):
+        """
+        Stream generated questions one at a time
+        Args:
+            text (str): The text to generate questions from
+            question_type (str): Type of questions to generate (novice/mcq/fill_blanks)
+        Yields:
+            dict: Question dictionaries as soon as each is complete
+        """
+        return self.qa_model.stream_questions(text, question_type)
+
     def answer_question(self, context, question):
         """
         Answer a question based on the context
@@ -87,5 +113,19 @@ class QAService:
             print(f"Error in word query service: {str(e)}")
             raise ValueError(f"Failed to query word meaning: {str(e)}")
 
+    def query_word_meanings(self, words):
+        """
+        Query meanings of several words with one model call per batch
+        Args:
+            words (list): Hindi words to query
+        Returns:
+            dict: Word -> dictionary containing meaning and example
+        """
+        try:
+            return self.qa_model.query_word_meanings(words)
+        except Exception as e:
+            print(f"Error in word batch query service: {str(e)}")
+            raise ValueError(f"Failed to query word meanings: {str(e)}")
+
 # Create a singleton instance
 qa_service = QAService() 
\ No newline at end of file
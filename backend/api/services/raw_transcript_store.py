@@ -0,0 +1,112 @@
+import sys
+import zlib
+from array import array
+from datetime import datetime
+from bson.binary import Binary
+
+
+class RawTranscriptStore:
+    """
+    Persistent store of raw YouTube transcript segments.
+
+    Each (video_id, language) is one `raw_transcripts` document holding
+    columnar, zlib-compressed arrays: segment start times and durations as
+    float64, the concatenated segment text, and the end offset of every
+    segment within that text. The segments can be rebuilt exactly, so
+    reprocessing or re-chunking never needs another YouTube round trip.
+    """
+
+    def __init__(self, db=None):
+        self._db = db
+
+    @property
+    def collection(self):
+        if self._db is None:
+            # Imported lazily so scripts can pass their own database
+            from .mongo_service import mongo_service
+            self._db = mongo_service.db
+        return self._db.raw_transcripts
+
+    @staticmethod
+    def _pack(values, typecode):
+        packed = array(typecode, values)
+        if sys.byteorder == 'big':
+            packed.byteswap()  # Always store little-endian
+        return Binary(zlib.compress(packed.tobytes()))
+
+    @staticmethod
+    def _unpack(data, typecode):
+        unpacked = array(typecode)
+        unpacked.frombytes(zlib.decompress(data))
+        if sys.byteorder == 'big':
+            unpacked.byteswap()
+        return unpacked
+
+    def save(self, video_id, language, segments):
+        """
+        Store transcript segments for a video, replacing any previous copy
+        Args:
+            video_id (str): YouTube video ID
+            language (str): Transcript language code
+            segments (list): Segment dicts with text, start and duration
+        """
+        texts = [segment.get('text', '') for segment in segments]
+        offsets = []
+        end = 0
+        for text in texts:
+            end += len(text)
+            offsets.append(end)
+
+        self.collection.replace_one(
+            {'video_id': video_id, 'language': language},
+            {
+                'video_id': video_id,
+                'language': language,
+                'segment_count': len(segments),
+                'starts': self._pack([float(segment.get('start', 0)) for segment in segments], 'd'),
+                'durations': self._pack([float(segment.get('duration', 0)) for segment in segments], 'd'),
+                'offsets': self._pack(offsets, 'I'),
+                'text': Binary(zlib.compress(''.join(texts).encode('utf-8'))),
+                'created_at': datetime.utcnow()
+            },
+            upsert=True
+        )
+
+    def load(self, video_id, languages=('hi',)):
+        """
+        Load stored segments for a video in the first available accepted language
+        Args:
+            video_id (str): YouTube video ID
+            languages (str | list): Accepted language codes in order of preference,
+                or None to accept any stored language (Hindi first)
+        Returns:
+            tuple: (segments, language), or None if no accepted language is stored
+        """
+        if isinstance(languages, str):
+            languages = [languages]
+        query = {'video_id': video_id}
+        if languages is not None:
+            query['language'] = {'$in': list(languages)}
+        preference = list(languages) if languages is not None else ['hi']
+
+        docs = list(self.collection.find(query))
+        docs.sort(key=lambda d: preference.index(d['language']) if d.get('language') in preference else len(preference))
+        doc = docs[0] if docs else None
+        if doc is None:
+            return None
+
+        starts = self._unpack(doc['starts'], 'd')
+        durations = self._unpack(doc['durations'], 'd')
+        offsets = self._unpack(doc['offsets'], 'I')
+        text = zlib.decompress(doc['text']).decode('utf-8')
+
+        segments = []
+        begin = 0
+        for start, duration, end in zip(starts, durations, offsets):
+            segments.append({'text': text[begin:end], 'start': start, 'duration': duration})
+            begin = end
+        return segments, doc['language']
+
+
+# Create singleton instance
+raw_transcript_store = RawTranscriptStore()
@@ -0,0 +1,85 @@
+import os
+import socket
+import threading
+import uuid
+from concurrent.futures import Future
+from datetime import datetime, timedelta
+from pymongo.errors import DuplicateKeyError
+from .mongo_service import mongo_service
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls for the same key onto one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait on its future and receive the same result or exception.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+
+    def do(self, key, fn, *args, **kwargs):
+        with self._lock:
+            future = self._calls.get(key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._calls[key] = future
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = fn(*args, **kwargs)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+
+
+class MongoLease:
+    """
+    Cross-process lease stored in the `leases` collection.
+
+    Only one holder can own a key until it releases it or the lease expires,
+    which lets separate gunicorn workers and scripts agree on who performs an
+    expensive computation.
+    """
+
+    def __init__(self, key, ttl_seconds=120):
+        self.key = key
+        self.ttl_seconds = ttl_seconds
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex}"
+
+    @property
+    def collection(self):
+        return mongo_service.db.leases
+
+    def acquire(self):
+        """Try to take the lease; returns True on success"""
+        now = datetime.utcnow()
+        expires_at = now + timedelta(seconds=self.ttl_seconds)
+        try:
+            self.collection.insert_one({
+                '_id': self.key,
+                'owner': self.owner,
+                'expires_at': expires_at
+            })
+            return True
+        except DuplicateKeyError:
+            # Take over a lease whose holder died without releasing it
+            taken = self.collection.find_one_and_update(
+                {'_id': self.key, 'expires_at': {'$lt': now}},
+                {'$set': {'owner': self.owner, 'expires_at': expires_at}}
+            )
+            return taken is not None
+
+    def release(self):
+        """Release the lease if we still hold it"""
+        self.collection.delete_one({'_id': self.key, 'owner': self.owner})
@@ -0,0 +1,39 @@
+from datetime import datetime
+from .mongo_service import mongo_service
+
+
+class TokenBlacklistService:
+    """
+    Blacklist of refresh token JTIs stored in the `token_blacklist` collection.
+
+    Entries expire with the token through a TTL index. Every check is an
+    indexed `_id` lookup on the primary, so a token blacklisted by any worker
+    is rejected by all workers from the moment the write is acknowledged.
+    Checks only happen on refresh and logout, which are low volume.
+    """
+
+    @property
+    def collection(self):
+        return mongo_service.db.token_blacklist
+
+    def blacklist(self, jti, expires_at, user_id=None):
+        """
+        Blacklist a token until it expires
+        Args:
+            jti (str): Token ID
+            expires_at (datetime): Token expiry (UTC)
+            user_id (str): Owner of the token
+        """
+        self.collection.update_one(
+            {'_id': jti},
+            {'$setOnInsert': {'user_id': user_id, 'expires_at': expires_at, 'blacklisted_at': datetime.utcnow()}},
+            upsert=True
+        )
+
+    def is_blacklisted(self, jti):
+        """Check whether a token ID has been blacklisted"""
+        return self.collection.find_one({'_id': jti}, {'_id': 1}) is not None
+
+
+# Create singleton instance
+token_blacklist_service = TokenBlacklistService()
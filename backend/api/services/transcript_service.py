@@ -0,0 +1,185 @@
+import time
+import logging
+from django.conf import settings
+from qa_engine.qa_model import qa_model
+from ..youtube_utils import get_transcript_cached, format_transcript
+from .mongo_service import mongo_service
+from .single_flight import SingleFlight, MongoLease
+from .vocabulary_service import vocabulary_service
+
+logger = logging.getLogger(__name__)
+
+
+class TranscriptService:
+    """
+    Video-level transcript processing shared by every user.
+
+    The punctuated text, translation and vocabulary only depend on the video,
+    so they are computed once per (video_id, language) and stored in the
+    `processed_videos` collection. Concurrent imports of the same video wait
+    for the single in-flight computation, both within a worker process and
+    across workers via a Mongo lease.
+    """
+
+    def __init__(self):
+        self._flight = SingleFlight()
+
+    @property
+    def lease_seconds(self):
+        return getattr(settings, 'PROCESSED_VIDEO_LEASE_SECONDS', 300)
+
+    @property
+    def wait_timeout(self):
+        return getattr(settings, 'PROCESSED_VIDEO_WAIT_TIMEOUT', 300)
+
+    @property
+    def poll_interval(self):
+        return getattr(settings, 'PROCESSED_VIDEO_POLL_INTERVAL', 1.0)
+
+    def get_processed(self, video_id, language=None):
+        """Return the stored processed transcript for a video, if any"""
+        return mongo_service.get_processed_video(video_id, language)
+
+    def get_or_process(self, video_id, language, formatted_transcript):
+        """
+        Get the processed transcript for a video, computing it at most once
+        Args:
+            video_id (str): YouTube video ID
+            language (str): Transcript language code
+            formatted_transcript (str): Formatted transcript text to process on a miss
+        Returns:
+            dict: The `processed_videos` document
+        """
+        processed = mongo_service.get_processed_video(video_id, language)
+        if processed:
+            logger.info(f"Using shared processed transcript for video {video_id}")
+            return processed
+
+        return self._flight.do(
+            f'{video_id}:{language}',
+            self._process_once,
+            video_id,
+            language,
+            formatted_transcript
+        )
+
+    def import_video(self, user_id, video_id, title='Untitled', on_progress=None):
+        """
+        Fetch, process and save a video transcript for a user
+        Args:
+            user_id (str): Owner of the new transcript
+            video_id (str): YouTube video ID
+            title (str): Title returned with the transcript
+            on_progress (callable): Optional callback receiving (stage, percent)
+        Returns:
+            dict: The saved transcript data
+        """
+        def report(stage, percent):
+            if on_progress:
+                on_progress(stage, percent)
+
+        # Reuse the shared processed transcript if any user imported this video before
+        processed_data = self.get_processed(video_id)
+        if processed_data:
+            logger.info("Found shared processed transcript for video")
+            language = processed_data['language']
+        else:
+            report('fetching', 10)
+            # Get transcript from the shared cache or YouTube
+            transcript_data, language = get_transcript_cached(video_id)
+            logger.info(f"Got transcript in {language}")
+            
+            formatted_transcript = format_transcript(transcript_data)
+            logger.info(f"Formatted transcript length: {len(formatted_transcript)}")
+            
+            # Process transcript with DeepSeek, once per video across all users
+            report('processing', 30)
+            logger.info("Processing transcript with DeepSeek")
+            try:
+                processed_data = self.get_or_process(video_id, language, formatted_transcript)
+                logger.info("Successfully processed transcript with DeepSeek")
+            except Exception as e:
+                logger.error(f"Failed to process transcript with DeepSeek: {str(e)}")
+                logger.error(f"Formatted transcript preview: {formatted_transcript[:200]}...")
+                raise ValueError("Failed to process transcript with DeepSeek")
+        
+        # Save processed transcript to MongoDB
+        report('saving', 90)
+        logger.info("Attempting to save processed transcript to MongoDB")
+        try:
+            result = mongo_service.save_transcript(
+                user_id=str(user_id),
+                video_id=video_id,
+                content=processed_data['punctuated_text'],
+                language=language,
+                translation=processed_data['translation'],
+                vocabulary=processed_data['vocabulary'],
+                processed_video_id=str(processed_data['_id'])
+            )
+            logger.info("Successfully saved processed transcript to MongoDB")
+        except KeyError as ke:
+            logger.error(f"Missing key in processed data: {str(ke)}")
+            logger.error(f"Processed data keys: {list(processed_data.keys())}")
+            raise ValueError(f"Invalid response format from DeepSeek: missing {str(ke)}")
+        except Exception as e:
+            logger.error(f"Failed to save transcript to MongoDB: {str(e)}")
+            raise
+        
+        return {
+            'id': str(result.inserted_id),
+            'video_id': video_id,
+            'title': title,
+            'content': processed_data['punctuated_text'],
+            'language': language,
+            'user_id': str(user_id),
+            'translation': processed_data['translation'],
+            'vocabulary': processed_data['vocabulary']
+        }
+
+    def _process_once(self, video_id, language, formatted_transcript):
+        """Process the transcript while holding the cross-process lease"""
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            processed = mongo_service.get_processed_video(video_id, language)
+            if processed:
+                return processed
+
+            lease = MongoLease(f'processed_video:{video_id}:{language}', ttl_seconds=self.lease_seconds)
+            if lease.acquire():
+                try:
+                    # Another worker may have finished between our read and the lease
+                    processed = mongo_service.get_processed_video(video_id, language)
+                    if processed:
+                        return processed
+
+                    logger.info(f"Processing transcript for video {video_id} with DeepSeek")
+                    processed_data = qa_model.process_transcript(formatted_transcript)
+                    processed = mongo_service.save_processed_video(video_id, language, processed_data)
+                    self._ingest_vocabulary(video_id, language, processed_data)
+                    return processed
+                finally:
+                    lease.release()
+
+            if time.monotonic() > deadline:
+                raise ValueError(f"Timed out waiting for transcript processing of video {video_id}")
+
+            logger.info(f"Waiting for another worker to process video {video_id}")
+            time.sleep(self.poll_interval)
+
+    @staticmethod
+    def _ingest_vocabulary(video_id, language, processed_data):
+        """Warm the global dictionary with a freshly processed transcript's vocabulary"""
+        if not getattr(settings, 'VOCABULARY_INGEST_ENABLED', True):
+            return
+        try:
+            added = vocabulary_service.ingest_vocabulary(
+                processed_data.get('vocabulary', []), video_id, language
+            )
+            logger.info(f"Added {added} words from video {video_id} to the global dictionary")
+        except Exception as e:
+            # The import must not fail because the dictionary could not be warmed
+            logger.error(f"Error ingesting vocabulary for video {video_id}: {str(e)}")
+
+
+# Create singleton instance
+transcript_service = TranscriptService()
@@ -0,0 +1,160 @@
+import hashlib
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from django.conf import settings
+from .mongo_service import mongo_service
+from .write_behind import IncrementBuffer
+
+# Time-windowed leaderboards and their length
+WINDOWS = {
+    '24h': timedelta(hours=24),
+    '7d': timedelta(days=7),
+}
+
+
+class TrendingService:
+    """
+    Materialized trending-words leaderboards served from memory.
+
+    The all-time board is the top `TRENDING_SIZE` global_words by frequency.
+    It is reloaded every TRENDING_REFRESH_INTERVAL seconds and patched in
+    place whenever this process flushes frequency increments. Windowed
+    boards (24h, 7d) are aggregated from hourly counters in
+    `word_frequency_buckets`, which expire through a TTL index.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._boards = {}
+        self._bucket_buffer = None
+
+    @property
+    def size(self):
+        return getattr(settings, 'TRENDING_SIZE', 20)
+
+    @property
+    def refresh_interval(self):
+        return getattr(settings, 'TRENDING_REFRESH_INTERVAL', 30)
+
+    @property
+    def bucket_buffer(self):
+        if self._bucket_buffer is None:
+            self._bucket_buffer = IncrementBuffer(
+                lambda: mongo_service.db.word_frequency_buckets,
+                flush_interval=getattr(settings, 'WORD_FREQUENCY_FLUSH_INTERVAL', 5.0),
+                key_filter=lambda key: {'word_id': key[0], 'bucket': key[1]},
+                upsert=True
+            )
+        return self._bucket_buffer
+
+    def record(self, word_id, amount=1):
+        """Count a lookup in the current hourly bucket"""
+        bucket = datetime.utcnow().replace(minute=0, second=0, microsecond=0)
+        self.bucket_buffer.add(
+            (word_id, bucket),
+            {'count': amount},
+            set_on_insert={'expires_at': bucket + max(WINDOWS.values()) + timedelta(hours=1)}
+        )
+
+    def leaderboard(self, window=None):
+        """
+        Get a trending leaderboard
+        Args:
+            window (str): None for all-time, or a key of WINDOWS
+        Returns:
+            tuple: (list of {word, meaning, frequency}, ETag of the list)
+        """
+        with self._lock:
+            board = self._boards.get(window)
+        if board is None or time.monotonic() - board['loaded_at'] > self.refresh_interval:
+            entries = self._load_window(window) if window else self._load_all_time()
+            board = self._store(window, entries)
+        return board['words'], board['etag']
+
+    def on_frequency_flush(self, flushed):
+        """
+        Patch the all-time board after global_words frequency increments were
+        written (IncrementBuffer on_flush callback with {word_id: increments})
+        """
+        with self._lock:
+            board = self._boards.get(None)
+        if board is None:
+            return
+
+        entries = {entry['_id']: dict(entry) for entry in board['entries']}
+        outside = []
+        for word_id, increments in flushed.items():
+            if word_id in entries:
+                entries[word_id]['frequency'] += increments.get('frequency', 0)
+            else:
+                outside.append(word_id)
+        if outside:
+            # Words that may have climbed onto the board
+            for word in mongo_service.db.global_words.find(
+                {'_id': {'$in': outside}},
+                {'word': 1, 'meaning_data': 1, 'frequency': 1}
+            ):
+                entries[word['_id']] = self._entry(word)
+
+        ranked = sorted(entries.values(), key=lambda entry: -entry['frequency'])[:self.size]
+        self._store(None, ranked, loaded_at=board['loaded_at'])
+
+    def _load_all_time(self):
+        words = mongo_service.db.global_words.find(
+            {},
+            {'word': 1, 'meaning_data': 1, 'frequency': 1}
+        ).sort('frequency', -1).limit(self.size)
+        return [self._entry(word) for word in words]
+
+    def _load_window(self, window):
+        since = datetime.utcnow() - WINDOWS[window]
+        results = mongo_service.db.word_frequency_buckets.aggregate([
+            {'$match': {'bucket': {'$gte': since}}},
+            {'$group': {'_id': '$word_id', 'frequency': {'$sum': '$count'}}},
+            {'$sort': {'frequency': -1}},
+            {'$limit': self.size},
+            {'$lookup': {
+                'from': 'global_words',
+                'localField': '_id',
+                'foreignField': '_id',
+                'as': 'word'
+            }},
+            {'$unwind': '$word'},
+            {'$project': {
+                'word': '$word.word',
+                'meaning_data': '$word.meaning_data',
+                'frequency': 1
+            }}
+        ])
+        return [self._entry(word) for word in results]
+
+    @staticmethod
+    def _entry(word):
+        return {
+            '_id': word['_id'],
+            'word': word['word'],
+            'meaning': (word.get('meaning_data') or {}).get('meaning', ''),
+            'frequency': word.get('frequency', 1)
+        }
+
+    def _store(self, window, entries, loaded_at=None):
+        words = [
+            {'word': entry['word'], 'meaning': entry['meaning'], 'frequency': entry['frequency']}
+            for entry in entries
+        ]
+        payload = json.dumps(words, ensure_ascii=False, sort_keys=True).encode('utf-8')
+        board = {
+            'entries': entries,
+            'words': words,
+            'etag': f'"{hashlib.sha1(payload).hexdigest()[:20]}"',
+            'loaded_at': time.monotonic() if loaded_at is None else loaded_at
+        }
+        with self._lock:
+            self._boards[window] = board
+        return board
+
+
+# Create singleton instance
+trending_service = TrendingService()
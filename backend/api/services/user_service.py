@@ -4,14 +4,13 @@ from django.contrib.auth.hashers import make_password, check_password
 from .mongo_service import mongo_service
 
 class UserService:
-    def __init__(self):
-        self.db = mongo_service.db
-        self._ensure_indexes()
+    @property
+    def db(self):
+        return mongo_service.db
 
-    def _ensure_indexes(self):
-        """Create necessary indexes for the users collection"""
-        self.db.users.create_index('email', unique=True)
-        self.db.users.create_index('username', unique=True)
+    def ensure_indexes(self):
+        """Create necessary indexes for the users collection (run by warm-up, not at import)"""
+        mongo_service.ensure_indexes(['users'])
 
     def create_user(self, email, password, first_name='', last_name=''):
         """Create a new user in MongoDB"""
@@ -0,0 +1,360 @@
+import re
+import time
+import logging
+import unicodedata
+from datetime import datetime
+from django.conf import settings
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from .memory_cache import LRUCache
+from .mongo_service import mongo_service
+from .single_flight import SingleFlight, MongoLease
+from .trending_service import trending_service
+from .write_behind import IncrementBuffer
+
+logger = logging.getLogger(__name__)
+
+# Zero-width space, non-joiner, joiner, word joiner and byte order mark
+ZERO_WIDTH_CHARACTERS = re.compile('[\u200b\u200c\u200d\u2060\ufeff]')
+WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_word(word):
+    """
+    Build the global_words lookup key for a word: NFC-normalized, zero-width
+    characters removed, whitespace trimmed and collapsed, and case-folded
+    (so English words still match case-insensitively).
+    """
+    word = unicodedata.normalize('NFC', word or '')
+    word = ZERO_WIDTH_CHARACTERS.sub('', word)
+    word = WHITESPACE.sub(' ', word).strip()
+    return word.casefold()
+
+
+class VocabularyService:
+    """
+    Access to the shared `global_words` dictionary.
+
+    Words are looked up by `normalized_word`, which has a unique index, so a
+    lookup is a single indexed equality match and a word can only be stored
+    once. Looked-up entries are kept in a memory-bounded in-process LRU, and
+    frequency increments are coalesced and flushed with bulk_write, so a
+    cache hit does not touch MongoDB at all. Cached entries are only
+    refreshed when they expire: edits made outside the web process (e.g.
+    backfill_normalized_words merging entries) are seen after at most
+    VOCABULARY_CACHE_TTL seconds, or immediately after a worker restart.
+    The meaning of a new word is requested from the LLM once: concurrent
+    lookups wait for the in-flight request, within a worker process and
+    across workers via a Mongo lease.
+    """
+
+    def __init__(self):
+        self._cache = None
+        self._frequency_buffer = None
+        self._flight = SingleFlight()
+
+    @property
+    def lease_seconds(self):
+        return getattr(settings, 'WORD_LOOKUP_LEASE_SECONDS', 60)
+
+    @property
+    def wait_timeout(self):
+        return getattr(settings, 'WORD_LOOKUP_WAIT_TIMEOUT', 60)
+
+    @property
+    def poll_interval(self):
+        return getattr(settings, 'WORD_LOOKUP_POLL_INTERVAL', 0.5)
+
+    @property
+    def cache(self):
+        if self._cache is None:
+            self._cache = LRUCache(
+                max_bytes=getattr(settings, 'VOCABULARY_CACHE_MAX_BYTES', 16 * 1024 * 1024),
+                ttl=getattr(settings, 'VOCABULARY_CACHE_TTL', 300)
+            )
+        return self._cache
+
+    @property
+    def frequency_buffer(self):
+        if self._frequency_buffer is None:
+            self._frequency_buffer = IncrementBuffer(
+                lambda: self.collection,
+                flush_interval=getattr(settings, 'WORD_FREQUENCY_FLUSH_INTERVAL', 5.0),
+                on_flush=trending_service.on_frequency_flush
+            )
+        return self._frequency_buffer
+
+    @property
+    def collection(self):
+        return mongo_service.db.global_words
+
+    def find_word(self, word):
+        """
+        Find a word in the global dictionary
+        Args:
+            word (str): Word as entered by the user
+        Returns:
+            dict: global_words document or None
+        """
+        normalized = normalize_word(word)
+        cached = self.cache.get(normalized)
+        if cached is not None:
+            return dict(cached)
+
+        global_word = self.collection.find_one(
+            {'normalized_word': normalized},
+            {'word': 1, 'normalized_word': 1, 'meaning_data': 1, 'frequency': 1}
+        )
+        if global_word:
+            self.cache.set(normalized, global_word)
+            return dict(global_word)
+        return None
+
+    def get_or_create(self, word, fetch_meaning):
+        """
+        Get a word from the global dictionary, fetching its meaning at most once
+        Args:
+            word (str): Word as entered by the user
+            fetch_meaning (callable): Returns the meaning data for a new word
+        Returns:
+            tuple: (global_words document, whether this call created it)
+        """
+        global_word = self.find_word(word)
+        if global_word:
+            return self.increment_frequency(global_word), False
+
+        created_by = []
+        global_word = self._flight.do(
+            normalize_word(word), self._create_once, word, fetch_meaning, created_by
+        )
+        if created_by:
+            return global_word, True
+        # Callers that waited for another lookup still count as a query
+        return self.increment_frequency(dict(global_word)), False
+
+    def _create_once(self, word, fetch_meaning, created_by):
+        """Fetch and store a new word while holding the cross-process lease"""
+        normalized = normalize_word(word)
+        deadline = time.monotonic() + self.wait_timeout
+        while True:
+            global_word = self.find_word(word)
+            if global_word:
+                return global_word
+
+            lease = MongoLease(f'global_word:{normalized}', ttl_seconds=self.lease_seconds)
+            if lease.acquire():
+                try:
+                    # Another worker may have stored it between our read and the lease
+                    global_word = self.find_word(word)
+                    if global_word:
+                        return global_word
+
+                    logger.info(f"Querying meaning of new word '{normalized}'")
+                    global_word = self.create_word(word, fetch_meaning(word))
+                    created_by.append(True)
+                    return global_word
+                finally:
+                    lease.release()
+
+            if time.monotonic() > deadline:
+                raise ValueError(f"Timed out waiting for the meaning of '{word}'")
+
+            time.sleep(self.poll_interval)
+
+    def find_words(self, words):
+        """
+        Find several words with one $in query for those not cached
+        Args:
+            words (list): Words as entered by the user
+        Returns:
+            dict: normalized word -> global_words document, for the words that exist
+        """
+        found = {}
+        missing = []
+        for normalized in {normalize_word(word) for word in words}:
+            cached = self.cache.get(normalized)
+            if cached is not None:
+                found[normalized] = dict(cached)
+            else:
+                missing.append(normalized)
+
+        if missing:
+            for global_word in self.collection.find(
+                {'normalized_word': {'$in': missing}},
+                {'word': 1, 'normalized_word': 1, 'meaning_data': 1, 'frequency': 1}
+            ):
+                self.cache.set(global_word['normalized_word'], global_word)
+                found[global_word['normalized_word']] = dict(global_word)
+        return found
+
+    def get_or_create_many(self, words, fetch_meanings, fetch_meaning=None):
+        """
+        Get several words from the global dictionary, fetching all new meanings
+        with one batched call and storing them with one bulk upsert
+        Args:
+            words (list): Words as entered by the user
+            fetch_meanings (callable): Returns {word: meaning data} for a list of new words
+            fetch_meaning (callable): Fallback for new words missing from the batch result
+        Returns:
+            tuple: (normalized word -> global_words document, normalized word -> error message)
+        """
+        originals = {}
+        for word in words:
+            originals.setdefault(normalize_word(word), word)
+        originals.pop('', None)
+
+        found = self.find_words(list(originals.values()))
+        for global_word in found.values():
+            self.increment_frequency(global_word)
+
+        new_words = [word for normalized, word in originals.items() if normalized not in found]
+        if not new_words:
+            return found, {}
+
+        meanings = {normalize_word(word): data for word, data in fetch_meanings(new_words).items()}
+        now = datetime.now()
+        operations = []
+        for word in new_words:
+            normalized = normalize_word(word)
+            if normalized not in meanings:
+                continue
+            operations.append(UpdateOne(
+                {'normalized_word': normalized},
+                {'$setOnInsert': {
+                    'word': word,
+                    'meaning_data': meanings[normalized],
+                    'frequency': 1,
+                    'created_at': now,
+                    'last_updated': now
+                }},
+                upsert=True
+            ))
+        if operations:
+            try:
+                result = self.collection.bulk_write(operations, ordered=False)
+                upserted_ids = result.upserted_ids.values()
+            except BulkWriteError as e:
+                # Upserts that raced with another insert of the same word already exist
+                if any(error.get('code') != 11000 for error in e.details.get('writeErrors', [])):
+                    raise
+                upserted_ids = [upserted['_id'] for upserted in e.details.get('upserted', [])]
+            for word_id in upserted_ids:
+                trending_service.record(word_id)
+            stored = self.find_words([word for word in new_words if normalize_word(word) in meanings])
+            found.update(stored)
+
+        errors = {}
+        for word in new_words:
+            normalized = normalize_word(word)
+            if normalized in found:
+                continue
+            if fetch_meaning is None:
+                errors[normalized] = f"No meaning returned for '{word}'"
+                continue
+            # The batch answer left this word out; look it up on its own
+            try:
+                found[normalized], _ = self.get_or_create(word, fetch_meaning)
+            except Exception as e:
+                errors[normalized] = str(e)
+        return found, errors
+
+    def ingest_vocabulary(self, vocabulary, video_id, language=None):
+        """
+        Add the vocabulary of a processed transcript to the global dictionary
+        with one bulk upsert, so those words are served without an LLM call.
+        Existing entries keep their meaning and only gain the source.
+        Args:
+            vocabulary (list): Items with word, meaning and example
+            video_id (str): Video the vocabulary was extracted from
+            language (str): Transcript language code
+        Returns:
+            int: Number of new global_words entries
+        """
+        now = datetime.now()
+        source = {'type': 'transcript', 'video_id': video_id, 'language': language}
+        operations = {}
+        for item in vocabulary or []:
+            word = (item.get('word') or '').strip()
+            normalized = normalize_word(word)
+            if not normalized or not item.get('meaning') or normalized in operations:
+                continue
+            operations[normalized] = UpdateOne(
+                {'normalized_word': normalized},
+                {
+                    '$setOnInsert': {
+                        'word': word,
+                        'meaning_data': {
+                            'meaning': item['meaning'],
+                            'example': item.get('example', {})
+                        },
+                        'frequency': 0,
+                        'created_at': now,
+                        'last_updated': now
+                    },
+                    '$addToSet': {'sources': source}
+                },
+                upsert=True
+            )
+        if not operations:
+            return 0
+
+        normalized_words = list(operations)
+        try:
+            result = self.collection.bulk_write(list(operations.values()), ordered=False)
+        except BulkWriteError as e:
+            errors = e.details.get('writeErrors', [])
+            if any(error.get('code') != 11000 for error in errors):
+                raise
+            # Words inserted concurrently by a lookup already exist: add the source to them
+            retries = [
+                UpdateOne({'normalized_word': normalized_words[error['index']]}, {'$addToSet': {'sources': source}})
+                for error in errors
+            ]
+            self.collection.bulk_write(retries, ordered=False)
+            return e.details.get('nUpserted', 0)
+        return result.upserted_count
+
+    def create_word(self, word, meaning_data):
+        """
+        Add a word to the global dictionary, or return the existing entry if
+        another request stored it first
+        Returns:
+            dict: global_words document
+        """
+        now = datetime.now()
+        doc = {
+            'word': word,
+            'normalized_word': normalize_word(word),
+            'meaning_data': meaning_data,
+            'frequency': 1,
+            'created_at': now,
+            'last_updated': now
+        }
+        try:
+            result = self.collection.insert_one(doc)
+        except DuplicateKeyError:
+            existing = self.find_word(word)
+            self.increment_frequency(existing)
+            return existing
+        doc['_id'] = result.inserted_id
+        self.cache.set(doc['normalized_word'], dict(doc))
+        trending_service.record(doc['_id'])
+        return doc
+
+    def increment_frequency(self, global_word, amount=1):
+        """
+        Count lookups of a word. The increment is buffered and written with
+        the next bulk flush; the returned document reflects it immediately.
+        """
+        self.frequency_buffer.add(global_word['_id'], {'frequency': amount})
+        trending_service.record(global_word['_id'], amount)
+        global_word['frequency'] = global_word.get('frequency', 0) + amount
+
+        cached = self.cache.get(global_word.get('normalized_word'))
+        if cached is not None and cached['_id'] == global_word['_id']:
+            cached['frequency'] = global_word['frequency']
+        return global_word
+
+
+# Create singleton instance
+vocabulary_service = VocabularyService()
@@ -0,0 +1,242 @@
+import atexit
+import logging
+import os
+import threading
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError
+
+logger = logging.getLogger(__name__)
+
+
+class BackgroundFlusher:
+    """
+    Base class for write-behind buffers.
+
+    Subclasses implement flush(); it is called from a daemon thread every
+    `flush_interval` seconds once something has been buffered, and at
+    interpreter exit. Pending writes are lost if the process is killed, so
+    only buffer data that can tolerate that.
+    """
+
+    def __init__(self, flush_interval=2.0, max_pending=500):
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._timer_pid = None
+        atexit.register(self.flush)
+
+    def flush(self):
+        raise NotImplementedError
+
+    def _ensure_timer(self):
+        # One flusher thread per process; forked workers start their own
+        pid = os.getpid()
+        if self._timer_pid == pid:
+            return
+        with self._lock:
+            if self._timer_pid == pid:
+                return
+            self._timer_pid = pid
+        thread = threading.Thread(target=self._run, name='write-behind-flush', daemon=True)
+        thread.start()
+
+    def _run(self):
+        stop = threading.Event()
+        while not stop.wait(self.flush_interval):
+            self.flush()
+
+
+class IncrementBuffer(BackgroundFlusher):
+    """
+    Write-behind buffer for counter increments.
+
+    Increments are accumulated in memory per key and written with one
+    unordered `bulk_write` of `$inc` updates when `max_pending` keys are
+    buffered or on the periodic flush. Increments of a key that failed
+    `max_attempts` flushes in a row are dropped.
+    """
+
+    def __init__(self, collection, flush_interval=2.0, max_pending=500, key_filter=None,
+                 upsert=False, on_flush=None, max_attempts=5):
+        """
+        Args:
+            collection (callable): Returns the pymongo collection to write to
+            flush_interval (float): Seconds between background flushes
+            max_pending (int): Number of buffered keys that triggers a flush
+            key_filter (callable): Maps a key to its update filter, default {'_id': key}
+            upsert (bool): Create missing documents when flushing
+            on_flush (callable): Called with the written {key: increments} after each flush
+            max_attempts (int): Failed flushes of a key before its increments are dropped
+        """
+        super().__init__(flush_interval, max_pending)
+        self.max_attempts = max_attempts
+        self._failures = {}
+        self._collection = collection
+        self._key_filter = key_filter or (lambda key: {'_id': key})
+        self._upsert = upsert
+        self._on_flush = on_flush
+        self._pending = {}
+        self._set_on_insert = {}
+
+    def add(self, key, increments, set_on_insert=None):
+        """
+        Buffer increments for a key
+        Args:
+            key: Hashable document key
+            increments (dict): Field -> amount to add
+            set_on_insert (dict): Fields for documents created by an upsert
+        """
+        with self._lock:
+            pending = self._pending.setdefault(key, {})
+            for field, amount in increments.items():
+                pending[field] = pending.get(field, 0) + amount
+            if set_on_insert:
+                self._set_on_insert[key] = set_on_insert
+            should_flush = len(self._pending) >= self.max_pending
+        self._ensure_timer()
+        if should_flush:
+            self.flush()
+
+    def pending(self, key):
+        """Return increments buffered for a key but not yet written"""
+        with self._lock:
+            return dict(self._pending.get(key, {}))
+
+    def flush(self):
+        """Write all buffered increments with one bulk_write"""
+        with self._flush_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                set_on_insert, self._set_on_insert = self._set_on_insert, {}
+            if not pending:
+                return
+
+            keys = list(pending)
+            operations = []
+            for key in keys:
+                update = {'$inc': pending[key]}
+                if key in set_on_insert:
+                    update['$setOnInsert'] = set_on_insert[key]
+                operations.append(UpdateOne(self._key_filter(key), update, upsert=self._upsert))
+            try:
+                self._collection().bulk_write(operations, ordered=False)
+            except BulkWriteError as e:
+                # Only the operations that failed are retried; the rest were applied
+                failed = {keys[error['index']] for error in e.details.get('writeErrors', [])}
+                logger.error(f"Error flushing {len(failed)} of {len(operations)} buffered increments")
+                self._restore(
+                    {key: pending[key] for key in failed},
+                    {key: fields for key, fields in set_on_insert.items() if key in failed}
+                )
+                pending = {key: increments for key, increments in pending.items() if key not in failed}
+                self._forget_failures(pending)
+                if not pending:
+                    return
+            except Exception as e:
+                logger.error(f"Error flushing {len(operations)} buffered increments: {str(e)}")
+                self._restore(pending, set_on_insert)
+                return
+            self._forget_failures(pending)
+
+        if self._on_flush:
+            try:
+                self._on_flush(pending)
+            except Exception as e:
+                logger.error(f"Error in flush callback: {str(e)}")
+
+    def _forget_failures(self, written):
+        with self._lock:
+            for key in written:
+                self._failures.pop(key, None)
+
+    def _restore(self, pending, set_on_insert):
+        """Put increments from a failed flush back so the next flush retries them"""
+        with self._lock:
+            for key in list(pending):
+                self._failures[key] = self._failures.get(key, 0) + 1
+                if self._failures[key] >= self.max_attempts:
+                    logger.error(f"Dropping increments for {key} after {self.max_attempts} failed flushes")
+                    del self._failures[key]
+                    del pending[key]
+            for key, increments in pending.items():
+                current = self._pending.setdefault(key, {})
+                for field, amount in increments.items():
+                    current[field] = current.get(field, 0) + amount
+            for key, fields in set_on_insert.items():
+                if key in pending:
+                    self._set_on_insert.setdefault(key, fields)
+
+
+class BatchWriter(BackgroundFlusher):
+    """
+    Write-behind queue of pymongo write operations.
+
+    Operations (InsertOne, UpdateOne, ...) are queued per collection and
+    written with one unordered `bulk_write` per collection when `max_pending`
+    operations are queued or on the periodic flush. Failed operations are
+    queued again, up to `max_attempts` writes; an InsertOne rejected as a
+    duplicate is dropped, since it can never succeed, while a duplicate key
+    error on an upsert (two concurrent upserts of the same key) is retried.
+    """
+
+    def __init__(self, database, flush_interval=1.0, max_pending=200, max_attempts=5):
+        """
+        Args:
+            database (callable): Returns the pymongo database to write to
+            flush_interval (float): Seconds between background flushes
+            max_pending (int): Number of queued operations that triggers a flush
+            max_attempts (int): Writes of an operation before it is dropped
+        """
+        super().__init__(flush_interval, max_pending)
+        self._database = database
+        self.max_attempts = max_attempts
+        self._queue = []
+
+    def add(self, collection_name, *operations):
+        """Queue write operations for a collection"""
+        with self._lock:
+            self._queue.extend((collection_name, operation, 0) for operation in operations)
+            should_flush = len(self._queue) >= self.max_pending
+        self._ensure_timer()
+        if should_flush:
+            self.flush()
+
+    def flush(self):
+        """Write all queued operations with one bulk_write per collection"""
+        with self._flush_lock:
+            with self._lock:
+                queue, self._queue = self._queue, []
+            if not queue:
+                return
+
+            by_collection = {}
+            for collection_name, operation, attempts in queue:
+                by_collection.setdefault(collection_name, []).append((operation, attempts + 1))
+
+            failed = []
+            for collection_name, entries in by_collection.items():
+                operations = [operation for operation, _ in entries]
+                try:
+                    self._database()[collection_name].bulk_write(operations, ordered=False)
+                except BulkWriteError as e:
+                    # Only the operations that failed are retried; the rest were applied
+                    errors = e.details.get('writeErrors', [])
+                    logger.error(f"Error writing {len(errors)} of {len(operations)} operations to {collection_name}")
+                    for error in errors:
+                        operation, attempts = entries[error['index']]
+                        if error.get('code') == 11000 and isinstance(operation, InsertOne):
+                            continue  # A duplicate insert will never succeed
+                        failed.append((collection_name, operation, attempts))
+                except Exception as e:
+                    logger.error(f"Error writing {len(operations)} operations to {collection_name}: {str(e)}")
+                    failed.extend((collection_name, operation, attempts) for operation, attempts in entries)
+
+            dropped = [entry for entry in failed if entry[2] >= self.max_attempts]
+            if dropped:
+                logger.error(f"Dropping {len(dropped)} operations after {self.max_attempts} failed writes")
+                failed = [entry for entry in failed if entry[2] < self.max_attempts]
+
+            if failed:
+                with self._lock:
+                    self._queue[:0] = failed
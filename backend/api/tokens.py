@@ -0,0 +1,29 @@
+from datetime import datetime
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from .services.token_blacklist_service import token_blacklist_service
+
+
+class MongoRefreshToken(RefreshToken):
+    """
+    Refresh token blacklisted through the MongoDB token_blacklist collection
+    instead of simplejwt's token_blacklist app and its SQLite tables.
+    """
+
+    def verify(self, *args, **kwargs):
+        self.check_blacklist()
+        super().verify(*args, **kwargs)
+
+    def check_blacklist(self):
+        """Raise TokenError if this token has been blacklisted"""
+        if token_blacklist_service.is_blacklisted(self.payload[api_settings.JTI_CLAIM]):
+            raise TokenError('Token is blacklisted')
+
+    def blacklist(self):
+        """Blacklist this token until it expires"""
+        token_blacklist_service.blacklist(
+            self.payload[api_settings.JTI_CLAIM],
+            datetime.utcfromtimestamp(self.payload['exp']),
+            self.payload.get(api_settings.USER_ID_CLAIM)
+        )
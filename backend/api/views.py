@@ -2,26 +2,40 @@ from django.shortcuts import render
 from django.contrib.auth import authenticate
 from django.core.exceptions import ValidationError
 from django.core.validators import validate_email
-from rest_framework import status, viewsets, permissions
+from rest_framework import exceptions, status, viewsets, permissions
 from rest_framework.decorators import api_view, permission_classes, action
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
-from rest_framework_simplejwt.token_blacklist.models import OutstandingToken, BlacklistedToken
-from api.services.mongo_service import mongo_service
+from rest_framework.renderers import JSONRenderer
+from rest_framework_simplejwt.views import TokenRefreshView
+from api.services.mongo_service import (
+    mongo_service,
+    TRANSCRIPT_SUMMARY_PROJECTION,
+    TRANSCRIPT_GENERATION_PROJECTION,
+    TRANSCRIPT_PROCESSING_PROJECTION
+)
 from api.services.user_service import user_service
-from bson import ObjectId
 from datetime import datetime
-from django.http import Http404
+from django.http import Http404, StreamingHttpResponse
 import logging
-from django.core.cache import cache
 from django.conf import settings
 import json
+from concurrent.futures import ThreadPoolExecutor
 
-from .serializers import TranscriptSerializer, QuestionSerializer
-from .youtube_utils import get_transcript, format_transcript, extract_video_id
+from .serializers import (
+    TranscriptSerializer, TranscriptSummarySerializer, QuestionSerializer, MongoTokenRefreshSerializer
+)
+from .tokens import MongoRefreshToken
+from .renderers import EventStreamRenderer, format_event
+from .pagination import MongoCursorPagination
+from .youtube_utils import extract_video_id
 from api.services.qa_service import qa_service
-from qa_engine.qa_model import qa_model  # Add this import
+from api.services.transcript_service import transcript_service
+from api.services.job_service import import_job_service
+from api.services.answer_service import answer_service
+from api.services.progress_service import progress_service
+from api.services.vocabulary_service import vocabulary_service, normalize_word
+from api.services.trending_service import trending_service, WINDOWS as TRENDING_WINDOWS
 
 from qa_engine.deepseek_utils import deepseek_query  # Your existing Deepseek integration
 from datetime import datetime
@@ -71,7 +85,7 @@ def signup(request):
         )
         
         # Create JWT tokens
-        refresh = RefreshToken()
+        refresh = MongoRefreshToken()
         refresh['user_id'] = user['id']
         refresh['email'] = user['email']
         
@@ -118,7 +132,7 @@ def login(request):
             user_service.update_last_login(user['id'])
             
             # Create JWT tokens
-            refresh = RefreshToken()
+            refresh = MongoRefreshToken()
             refresh['user_id'] = user['id']
             refresh['email'] = user['email']
             
@@ -151,18 +165,21 @@ def logout(request):
         if not refresh_token:
             return Response({'error': 'Refresh token is required'}, status=status.HTTP_400_BAD_REQUEST)
             
-        token = RefreshToken(refresh_token)
+        token = MongoRefreshToken(refresh_token)
         token.blacklist()
         
         return Response({'message': 'Successfully logged out'}, status=status.HTTP_200_OK)
     except Exception as e:
         return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
 
+class MongoTokenRefreshView(TokenRefreshView):
+    serializer_class = MongoTokenRefreshSerializer
+
 class TranscriptViewSet(viewsets.ModelViewSet):
     permission_classes = [IsAuthenticated]
     serializer_class = TranscriptSerializer
 
-    def get_queryset(self):
+    def get_queryset(self, paginator=None):
         user_id = getattr(self.request, 'user_id', None)
         if not user_id:
             return []
@@ -170,40 +187,72 @@ class TranscriptViewSet(viewsets.ModelViewSet):
         # Check if we should filter favorites only
         favorites_only = self.request.query_params.get('favorite', '').lower() == 'true'
         
-        # Get transcripts from MongoDB and convert ObjectIds to strings
-        query = {'user_id': str(user_id)}
-        if favorites_only:
-            query['is_favorite'] = True
-            
-        transcripts = list(mongo_service.db.transcripts.find(query))
-        for transcript in transcripts:
-            transcript['id'] = str(transcript['_id'])
-        return transcripts
+        return mongo_service.get_user_transcripts(
+            str(user_id),
+            favorites_only=favorites_only,
+            projection=self._projection(),
+            paginator=paginator
+        )
 
-    def get_object(self):
+    def _summary_view(self):
+        return self.request.query_params.get('view', '').lower() == 'summary'
+
+    def _projection(self):
+        # The summary view leaves the large text fields out of the query
+        return TRANSCRIPT_SUMMARY_PROJECTION if self._summary_view() else None
+
+    def _expand_questions(self):
+        return 'questions' in self.request.query_params.get('expand', '').split(',')
+
+    def _serialize_transcripts(self, transcripts, many):
+        """Serialize transcripts with question counts (and questions if expanded) fetched in one query each"""
+        transcript_ids = [transcript['id'] for transcript in transcripts]
+        context = self.get_serializer_context()
+        if self._expand_questions():
+            context['questions'] = mongo_service.get_questions_by_transcript(transcript_ids)
+            context['question_counts'] = {
+                transcript_id: self._count_by_type(questions)
+                for transcript_id, questions in context['questions'].items()
+            }
+        else:
+            context['question_counts'] = mongo_service.count_questions_by_transcript(transcript_ids)
+
+        serializer_class = TranscriptSummarySerializer if self._summary_view() else TranscriptSerializer
+        serializer = serializer_class(transcripts if many else transcripts[0], many=many, context=context)
+        return serializer.data
+
+    @staticmethod
+    def _count_by_type(questions):
+        counts = {}
+        for question in questions:
+            q_type = question.get('type', 'novice')
+            counts[q_type] = counts.get(q_type, 0) + 1
+        return counts
+
+    def list(self, request, *args, **kwargs):
+        paginator = MongoCursorPagination(request)
+        if not paginator.enabled:
+            return Response(self._serialize_transcripts(self.get_queryset(), many=True))
+
+        transcripts, next_cursor = paginator.paginate(self.get_queryset(paginator))
+        return Response({
+            'results': self._serialize_transcripts(transcripts, many=True),
+            'next': next_cursor
+        })
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self._serialize_transcripts([self.get_object()], many=False))
+
+    def get_object(self, projection=None):
         pk = self.kwargs.get('pk')
         user_id = getattr(self.request, 'user_id', None)
         
-        # Try to find transcript by video_id first
-        transcript = mongo_service.db.transcripts.find_one({
-            'video_id': pk,
-            'user_id': str(user_id)
-        })
-        
-        # If not found, try as ObjectId (for backwards compatibility)
-        if not transcript:
-            try:
-                transcript = mongo_service.db.transcripts.find_one({
-                    '_id': ObjectId(pk),
-                    'user_id': str(user_id)
-                })
-            except:
-                pass
+        # Find transcript by video_id, or by ObjectId for backwards compatibility
+        transcript = mongo_service.get_user_transcript(str(user_id), pk, projection or self._projection())
                 
         if not transcript:
             raise Http404("Transcript not found")
             
-        transcript['id'] = str(transcript['_id'])
         return transcript
 
     def destroy(self, request, *args, **kwargs):
@@ -224,6 +273,9 @@ class TranscriptViewSet(viewsets.ModelViewSet):
                     {'error': 'Transcript not found'},
                     status=status.HTTP_404_NOT_FOUND
                 )
+
+            if settings.PRACTICE_SUMMARY_ENABLED:
+                mongo_service.remove_from_practice_summary(str(user_id), transcript_id)
                 
             return Response(status=status.HTTP_204_NO_CONTENT)
             
@@ -280,67 +332,26 @@ class TranscriptViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Try to get transcript from cache first
-            cache_key = f'transcript_{video_id}'
-            cached_data = cache.get(cache_key)
-            
-            if cached_data:
-                logger.info("Found transcript in cache")
-                transcript_data, language = cached_data
-            else:
-                # Get transcript from YouTube
-                logger.info("Attempting to fetch transcript from YouTube")
-                transcript_data, language = get_transcript(video_id)
-                logger.info(f"Successfully fetched transcript in {language}")
-                
-                # Cache the transcript
-                cache.set(cache_key, (transcript_data, language), settings.TRANSCRIPT_CACHE_TIMEOUT)
-            
-            formatted_transcript = format_transcript(transcript_data)
-            logger.info(f"Formatted transcript length: {len(formatted_transcript)}")
-            
-            # Process transcript with DeepSeek
-            logger.info("Processing transcript with DeepSeek")
-            try:
-                processed_data = qa_model.process_transcript(formatted_transcript)
-                logger.info("Successfully processed transcript with DeepSeek")
-                logger.debug(f"Processed data structure: {list(processed_data.keys())}")
-            except Exception as e:
-                logger.error(f"Failed to process transcript with DeepSeek: {str(e)}")
-                logger.error(f"Formatted transcript preview: {formatted_transcript[:200]}...")
-                raise ValueError("Failed to process transcript with DeepSeek")
-            
-            # Save processed transcript to MongoDB
-            logger.info("Attempting to save processed transcript to MongoDB")
-            try:
-                result = mongo_service.save_transcript(
-                    user_id=str(user_id),
-                    video_id=video_id,
-                    content=processed_data['punctuated_text'],
-                    language=language,
-                    translation=processed_data['translation'],
-                    vocabulary=processed_data['vocabulary']
+            title = request.data.get('title', 'Untitled')
+
+            # Run the import in the background when requested; the client polls the job status
+            run_async = request.data.get('async', settings.TRANSCRIPT_IMPORT_ASYNC)
+            if str(run_async).lower() == 'true':
+                job = import_job_service.submit_import(str(user_id), video_id, title)
+                logger.info(f"Queued import job {job['_id']} for video {video_id}")
+                return Response(
+                    {
+                        **import_job_service.serialize(job),
+                        'status_url': f"/api/transcripts/jobs/{job['_id']}/"
+                    },
+                    status=status.HTTP_202_ACCEPTED
                 )
-                logger.info("Successfully saved processed transcript to MongoDB")
-            except KeyError as ke:
-                logger.error(f"Missing key in processed data: {str(ke)}")
-                logger.error(f"Processed data keys: {list(processed_data.keys())}")
-                raise ValueError(f"Invalid response format from DeepSeek: missing {str(ke)}")
-            except Exception as e:
-                logger.error(f"Failed to save transcript to MongoDB: {str(e)}")
-                raise
-            
-            # Return the saved transcript data
-            saved_transcript = {
-                'id': str(result.inserted_id),
-                'video_id': video_id,
-                'title': request.data.get('title', 'Untitled'),
-                'content': processed_data['punctuated_text'],
-                'language': language,
-                'user_id': str(user_id),
-                'translation': processed_data['translation'],
-                'vocabulary': processed_data['vocabulary']
-            }
+
+            saved_transcript = transcript_service.import_video(
+                user_id=str(user_id),
+                video_id=video_id,
+                title=title
+            )
             
             logger.info("Successfully completed transcript creation and processing")
             return Response(saved_transcript, status=status.HTTP_201_CREATED)
@@ -360,6 +371,17 @@ class TranscriptViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @action(detail=False, methods=['get'], url_path=r'jobs/(?P<job_id>[^/.]+)')
+    def import_job_status(self, request, job_id=None):
+        """Report the status and progress of a background transcript import"""
+        job = import_job_service.get_job(job_id, str(request.user_id))
+        if not job:
+            return Response(
+                {'error': 'Import job not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(import_job_service.serialize(job))
+
     @action(detail=True, methods=['post'])
     def toggle_favorite(self, request, pk=None):
         try:
@@ -387,7 +409,7 @@ class TranscriptViewSet(viewsets.ModelViewSet):
     def process_transcript(self, request, pk=None):
         """Process transcript with DeepSeek for punctuation and translation"""
         try:
-            transcript = self.get_object()
+            transcript = self.get_object(projection=TRANSCRIPT_PROCESSING_PROJECTION)
             if not transcript:
                 return Response(
                     {'error': 'Transcript not found'},
@@ -431,15 +453,7 @@ class TranscriptViewSet(viewsets.ModelViewSet):
                 processed_data = json.loads(response)
                 
                 # Update transcript in MongoDB
-                mongo_service.db.transcripts.update_one(
-                    {'_id': ObjectId(pk)},
-                    {
-                        '$set': {
-                            'processed_content': processed_data,
-                            'updated_at': datetime.utcnow()
-                        }
-                    }
-                )
+                mongo_service.set_processed_content(transcript['_id'], processed_data)
                 
                 return Response(processed_data, status=status.HTTP_200_OK)
                 
@@ -460,30 +474,32 @@ class QuestionViewSet(viewsets.ModelViewSet):
     serializer_class = QuestionSerializer
     permission_classes = [permissions.IsAuthenticated]
 
-    def get_queryset(self):
+    def get_queryset(self, paginator=None):
         transcript_id = self.kwargs.get('transcript_pk')
         # Fetch questions from MongoDB
-        questions = list(mongo_service.db.qa_pairs.find({
-            'transcript_id': transcript_id
-        }))
-        for question in questions:
-            question['_id'] = str(question['_id'])
-        return questions
+        return mongo_service.get_questions(transcript_id, paginator)
+
+    def list(self, request, *args, **kwargs):
+        paginator = MongoCursorPagination(request)
+        if not paginator.enabled:
+            return super().list(request, *args, **kwargs)
+
+        questions, next_cursor = paginator.paginate(self.get_queryset(paginator))
+        return Response({
+            'results': self.get_serializer(questions, many=True).data,
+            'next': next_cursor
+        })
 
     def get_object(self):
         question_id = self.kwargs.get('pk')
         transcript_id = self.kwargs.get('transcript_pk')
         
         # Get question from MongoDB
-        question = mongo_service.db.qa_pairs.find_one({
-            '_id': ObjectId(question_id),
-            'transcript_id': transcript_id
-        })
+        question = mongo_service.get_question(transcript_id, question_id)
         
         if not question:
             raise Http404("Question not found")
             
-        question['_id'] = str(question['_id'])
         return question
 
     @action(detail=False, methods=['post'])
@@ -491,8 +507,8 @@ class QuestionViewSet(viewsets.ModelViewSet):
         try:
             print(f"Generating questions for transcript {transcript_pk}")
             
-            # Validate transcript exists and belongs to user
-            transcript = mongo_service.db.transcripts.find_one({'_id': ObjectId(transcript_pk)})
+            # Validate transcript exists, reading only what generation needs
+            transcript = mongo_service.get_transcript(transcript_pk, TRANSCRIPT_GENERATION_PROJECTION)
             if not transcript:
                 return Response(
                     {'error': 'Transcript not found'},
@@ -504,41 +520,45 @@ class QuestionViewSet(viewsets.ModelViewSet):
             if not isinstance(question_types, list):
                 question_types = [question_types]
             
-            created_questions = []
-            
-            # Generate questions for each type
-            for question_type in question_types:
-                if not qa_service.validate_question_type(question_type):
-                    continue  # Skip invalid types
-                    
-                print(f"Generating {question_type} questions...")
-                
-                # Generate questions using QA service
-                response = qa_service.generate_questions(
+            question_types = [t.lower() for t in question_types if qa_service.validate_question_type(t)]  # Skip invalid types
+            if not question_types:
+                return Response([], status=status.HTTP_201_CREATED)
+
+            combined = str(request.data.get('combined', False)).lower() == 'true'
+            if combined:
+                # One prompt covering every requested type
+                print(f"Generating {', '.join(question_types)} questions in one prompt...")
+                questions_by_type = qa_service.generate_questions_combined(
                     text=transcript['content'],
-                    question_type=question_type
+                    question_types=question_types
                 )
-                
-                questions = response.get('qa_pairs', []) if isinstance(response, dict) else response
+            else:
+                # One prompt per type, run concurrently
+                max_workers = min(settings.QUESTION_GENERATION_MAX_WORKERS, len(question_types))
+                print(f"Generating {', '.join(question_types)} questions with {max_workers} workers...")
+                with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                    responses = executor.map(
+                        lambda question_type: qa_service.generate_questions(
+                            text=transcript['content'],
+                            question_type=question_type
+                        ),
+                        question_types
+                    )
+                    questions_by_type = {
+                        question_type: response.get('qa_pairs', []) if isinstance(response, dict) else response
+                        for question_type, response in zip(question_types, responses)
+                    }
+            
+            created_questions = []
+            for question_type in question_types:
+                questions = questions_by_type.get(question_type, [])
                 print(f"Generated {len(questions)} {question_type} questions")
                 
-                # Create questions in MongoDB
                 for q in questions:
-                    question_data = {
-                        'transcript_id': transcript_pk,
-                        'video_id': transcript['video_id'],
-                        'video_title': transcript.get('title', ''),
-                        'question_text': q['question'],
-                        'answer': q['answer'],
-                        'type': question_type,
-                        'options': q.get('options', []),
-                        'created_at': datetime.utcnow(),
-                        'attempts': 0,
-                        'correct_attempts': 0
-                    }
-                    result = mongo_service.db.qa_pairs.insert_one(question_data)
-                    question_data['_id'] = str(result.inserted_id)
-                    created_questions.append(question_data)
+                    created_questions.append(self._question_document(transcript, transcript_pk, question_type, q))
+
+            # Create questions in MongoDB with a single round trip
+            self._save_questions(transcript, created_questions)
             
             return Response(created_questions, status=status.HTTP_201_CREATED)
             
@@ -549,6 +569,112 @@ class QuestionViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
 
+    @staticmethod
+    def _question_document(transcript, transcript_pk, question_type, q):
+        """Build the qa_pairs document for a generated question"""
+        return {
+            'transcript_id': transcript_pk,
+            'video_id': transcript['video_id'],
+            'video_title': transcript.get('title', ''),
+            'question_text': q['question'],
+            'answer': q['answer'],
+            'type': question_type,
+            'options': q.get('options', []),
+            'created_at': datetime.utcnow(),
+            'attempts': 0,
+            'correct_attempts': 0
+        }
+
+    @staticmethod
+    def _save_questions(transcript, created_questions):
+        """Insert generated questions with one insert_many and update the practice summary"""
+        if not created_questions:
+            return
+        # Mark the insert first, so a concurrent summary rebuild that already
+        # counts these questions is not stored before their increment
+        update_summary = settings.PRACTICE_SUMMARY_ENABLED and transcript.get('user_id')
+        if update_summary:
+            mongo_service.begin_practice_summary_update(transcript['user_id'])
+
+        counts = None
+        try:
+            inserted_ids = mongo_service.insert_questions(created_questions)
+            counts = {}
+            for question_data, inserted_id in zip(created_questions, inserted_ids):
+                question_data['_id'] = str(inserted_id)
+                counts[question_data['type']] = counts.get(question_data['type'], 0) + 1
+        finally:
+            if update_summary:
+                mongo_service.increment_practice_summary(transcript['user_id'], transcript, counts)
+
+    @action(
+        detail=False,
+        methods=['post'],
+        url_path='generate-stream',
+        renderer_classes=[EventStreamRenderer, JSONRenderer]
+    )
+    def generate_stream(self, request, transcript_pk=None):
+        """
+        Generate questions and stream each one as a server-sent event as soon as
+        the model has written it. Emits `question` events, then a `done` event
+        with the saved questions, or an `error` event.
+        """
+        transcript = mongo_service.get_transcript(transcript_pk, TRANSCRIPT_GENERATION_PROJECTION)
+        if not transcript:
+            return Response(
+                {'error': 'Transcript not found'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+
+        question_types = request.data.get('types', qa_service.get_supported_question_types())
+        if not isinstance(question_types, list):
+            question_types = [question_types]
+        question_types = [t.lower() for t in question_types if qa_service.validate_question_type(t)]
+
+        def event_stream():
+            created_questions = []
+            error = None
+            try:
+                for question_type in question_types:
+                    for q in qa_service.stream_questions(transcript['content'], question_type):
+                        if not isinstance(q, dict) or 'question' not in q or 'answer' not in q:
+                            continue
+                        created_questions.append(self._question_document(transcript, transcript_pk, question_type, q))
+                        yield format_event('question', {
+                            'question_text': q['question'],
+                            'answer': q['answer'],
+                            'type': question_type,
+                            'options': q.get('options', [])
+                        })
+            except GeneratorExit:
+                # The client disconnected; keep whatever was generated
+                try:
+                    self._save_questions(transcript, created_questions)
+                except Exception as e:
+                    logger.error(f"Error saving streamed questions: {str(e)}")
+                raise
+            except Exception as e:
+                logger.error(f"Error streaming questions: {str(e)}")
+                error = str(e)
+
+            # Keep whatever was generated, in one round trip
+            try:
+                self._save_questions(transcript, created_questions)
+            except Exception as e:
+                logger.error(f"Error saving streamed questions: {str(e)}")
+                yield format_event('error', {'error': f'Failed to save questions: {str(e)}'})
+                return
+
+            if error:
+                yield format_event('error', {'error': error})
+            else:
+                yield format_event('done', created_questions)
+
+        response = StreamingHttpResponse(event_stream(), content_type='text/event-stream')
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+        return response
+
     @action(detail=True, methods=['post'])
     def toggle_favorite(self, request, transcript_pk=None, pk=None):
         try:
@@ -566,7 +692,6 @@ class QuestionViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['post'], url_path='answer')
     def submit_answer(self, request, transcript_pk=None, pk=None):
         try:
-            question = self.get_object()
             submitted_answer = request.data.get('answer', '').strip()
 
             if not submitted_answer:
@@ -575,50 +700,24 @@ class QuestionViewSet(viewsets.ModelViewSet):
                     status=status.HTTP_400_BAD_REQUEST
                 )
 
-            # Handle MongoDB question
-            if isinstance(question, dict):
-                correct_answer = question.get('answer', '').strip()
-                is_correct = submitted_answer.lower() == correct_answer.lower()
-                
-                # Update MongoDB document with attempt information
-                mongo_service.db.qa_pairs.update_one(
-                    {'_id': ObjectId(question['_id'])},
-                    {
-                        '$inc': {
-                            'attempts': 1,
-                            'correct_attempts': 1 if is_correct else 0
-                        }
-                    }
+            # Check the answer and update attempt counters in one round trip
+            result = answer_service.record_answer(
+                pk, submitted_answer, transcript_id=transcript_pk, user_id=str(request.user_id)
+            )
+            if result is None:
+                return Response(
+                    {'error': 'Question not found'},
+                    status=status.HTTP_404_NOT_FOUND
                 )
-                
-                # Get updated question data
-                updated_question = mongo_service.db.qa_pairs.find_one({'_id': ObjectId(question['_id'])})
-                
-                return Response({
-                    'is_correct': is_correct,
-                    'correct_answer': correct_answer if not is_correct else None,
-                    'feedback': 'Correct!' if is_correct else 'Incorrect. Try again!',
-                    'attempts': updated_question.get('attempts', 1),
-                    'correct_attempts': updated_question.get('correct_attempts', 1 if is_correct else 0)
-                })
-
-            # Handle Django model question
-            else:
-                correct_answer = question.answer.strip()
-                is_correct = submitted_answer.lower() == correct_answer.lower()
-
-                question.attempts = question.attempts + 1
-                if is_correct:
-                    question.correct_attempts = question.correct_attempts + 1
-                question.save()
+            is_correct = result['is_correct']
 
-                return Response({
-                    'is_correct': is_correct,
-                    'correct_answer': correct_answer if not is_correct else None,
-                    'feedback': 'Correct!' if is_correct else 'Incorrect. Try again!',
-                    'attempts': question.attempts,
-                    'correct_attempts': question.correct_attempts
-                })
+            return Response({
+                'is_correct': is_correct,
+                'correct_answer': result['correct_answer'] if not is_correct else None,
+                'feedback': 'Correct!' if is_correct else 'Incorrect. Try again!',
+                'attempts': result['attempts'],
+                'correct_attempts': result['correct_attempts']
+            })
 
         except Exception as e:
             return Response(
@@ -630,37 +729,17 @@ class QuestionViewSet(viewsets.ModelViewSet):
 @permission_classes([IsAuthenticated])
 def get_practice_sets(request):
     try:
-        # Get all transcripts for the user from MongoDB
-        transcripts = list(mongo_service.db.transcripts.find({
-            'user_id': str(request.user_id)
-        }))
-        
-        practice_sets = []
-        for transcript in transcripts:
-            transcript_id = str(transcript['_id'])
-            # Get questions for this transcript
-            questions = list(mongo_service.db.qa_pairs.find({
-                'transcript_id': transcript_id
-            }))
-            
-            if questions:
-                # Group questions by type
-                question_types = {}
-                for q in questions:
-                    q_type = q.get('type', 'novice')  # Default to novice if type not specified
-                    if q_type not in question_types:
-                        question_types[q_type] = []
-                    question_types[q_type].append(q)
-                
-                # Create a practice set entry for each type
-                for q_type, type_questions in question_types.items():
-                    practice_sets.append({
-                        'id': transcript_id,
-                        'title': transcript.get('title', 'Untitled'),
-                        'video_id': transcript['video_id'],
-                        'type': q_type,
-                        'question_count': len(type_questions)
-                    })
+        user_id = str(request.user_id)
+        practice_sets = None
+        if settings.PRACTICE_SUMMARY_ENABLED:
+            practice_sets = mongo_service.get_practice_summary(user_id)
+
+        if practice_sets is None:
+            # Count questions per transcript and type in a single aggregation
+            if settings.PRACTICE_SUMMARY_ENABLED:
+                practice_sets = mongo_service.rebuild_practice_summary(user_id)
+            else:
+                practice_sets = mongo_service.aggregate_practice_sets(user_id)
         
         return Response(practice_sets)
     except Exception as e:
@@ -673,11 +752,8 @@ def get_practice_sets(request):
 @permission_classes([IsAuthenticated])
 def get_practice_questions(request, video_id, question_type):
     try:
-        # Get transcript from MongoDB
-        transcript = mongo_service.db.transcripts.find_one({
-            'video_id': video_id,
-            'user_id': str(request.user_id)
-        })
+        # Get only the transcript title and text from MongoDB
+        transcript = mongo_service.get_practice_transcript(str(request.user_id), video_id)
         
         if not transcript:
             return Response(
@@ -686,14 +762,17 @@ def get_practice_questions(request, video_id, question_type):
             )
         
         # Get questions from MongoDB
-        questions = list(mongo_service.db.qa_pairs.find({
-            'video_id': video_id,
-            'type': question_type
-        }))
+        questions = mongo_service.get_practice_questions(video_id, question_type)
+        
+        # The user's own attempts on this practice set
+        user_progress = progress_service.get_question_progress(
+            str(request.user_id), video_id, question_type
+        )
         
         # Format questions for frontend
         formatted_questions = []
         for question in questions:
+            question_progress = user_progress.get(str(question['_id']), {})
             formatted_question = {
                 '_id': str(question['_id']),
                 'question_text': question.get('question_text', ''),
@@ -703,7 +782,9 @@ def get_practice_questions(request, video_id, question_type):
                 'video_id': video_id,
                 'video_title': question.get('video_title', transcript.get('title', 'Untitled')),
                 'attempts': question.get('attempts', 0),
-                'correct_attempts': question.get('correct_attempts', 0)
+                'correct_attempts': question.get('correct_attempts', 0),
+                'user_attempts': question_progress.get('attempts', 0),
+                'user_correct_attempts': question_progress.get('correct_attempts', 0)
             }
             formatted_questions.append(formatted_question)
         
@@ -724,41 +805,20 @@ def get_practice_questions(request, video_id, question_type):
 @permission_classes([IsAuthenticated])
 def submit_answer(request, question_id):
     try:
-        # Get question from MongoDB
-        question = mongo_service.db.qa_pairs.find_one({
-            '_id': ObjectId(question_id)
-        })
+        user_answer = request.data.get('answer', '').strip()
+        result = answer_service.record_answer(question_id, user_answer, user_id=str(request.user_id))
         
-        if not question:
+        if not result:
             return Response(
                 {'error': 'Question not found'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        user_answer = request.data.get('answer', '').strip()
-        correct_answer = question['answer'].strip()
-        is_correct = user_answer.lower() == correct_answer.lower()
-        
-        # Update question stats in MongoDB
-        mongo_service.db.qa_pairs.update_one(
-            {'_id': ObjectId(question_id)},
-            {
-                '$inc': {
-                    'attempts': 1,
-                    'correct_attempts': 1 if is_correct else 0
-                }
-            }
-        )
-        
-        updated_question = mongo_service.db.qa_pairs.find_one({
-            '_id': ObjectId(question_id)
-        })
-        
         return Response({
-            'is_correct': is_correct,
-            'correct_answer': correct_answer,
-            'attempts': updated_question['attempts'],
-            'correct_attempts': updated_question['correct_attempts']
+            'is_correct': result['is_correct'],
+            'correct_answer': result['correct_answer'],
+            'attempts': result['attempts'],
+            'correct_attempts': result['correct_attempts']
         })
     except Exception as e:
         return Response(
@@ -766,15 +826,29 @@ def submit_answer(request, question_id):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def get_user_progress(request):
+    """Get the user's answer progress, optionally filtered by ?video_id= and ?type="""
+    try:
+        progress = progress_service.get_progress(
+            str(request.user_id),
+            video_id=request.query_params.get('video_id'),
+            question_type=request.query_params.get('type')
+        )
+        return Response(progress)
+    except Exception as e:
+        return Response(
+            {'error': str(e)},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def get_transcript_by_video(request, video_id):
     try:
         # Get transcript from MongoDB
-        transcript = mongo_service.db.transcripts.find_one({
-            'video_id': video_id,
-            'user_id': str(request.user_id)
-        })
+        transcript = mongo_service.get_transcript_by_user_and_video(str(request.user_id), video_id)
         
         if not transcript:
             return Response(
@@ -782,7 +856,7 @@ def get_transcript_by_video(request, video_id):
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        transcript['_id'] = str(transcript['_id'])
+        transcript['_id'] = transcript.pop('id')
         return Response(transcript)
     except Exception as e:
         return Response(
@@ -882,81 +956,26 @@ def query_word(request):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        db = mongo_service.db
-        
-        # Check global dictionary first with normalized word
-        global_word = db.global_words.find_one({'word': word})
-        
-        if global_word:
-            # Word exists, increment frequency
-            try:
-                db.global_words.update_one(
-                    {'_id': global_word['_id']},
-                    {'$inc': {'frequency': 1}}
-                )
-                meaning_data = global_word['meaning_data']
-            except Exception as e:
-                logger.error(f"Error updating word frequency: {str(e)}")
-                # Continue with existing meaning data even if update fails
-                meaning_data = global_word['meaning_data']
-        else:
-            try:
-                # Check for similar words (case-insensitive and ignoring spaces)
-                similar_word = db.global_words.find_one({
-                    'word': {'$regex': f'^{word}\\s*$', '$options': 'i'}
-                })
-                
-                if similar_word:
-                    # Use existing word instead of creating a new one
-                    global_word = similar_word
-                    db.global_words.update_one(
-                        {'_id': global_word['_id']},
-                        {'$inc': {'frequency': 1}}
-                    )
-                    meaning_data = global_word['meaning_data']
-                else:
-                    # Use qa_service to get word meaning for new word
-                    meaning_data = qa_service.query_word_meaning(word)
-                    
-                    # Save to global dictionary
-                    global_word = db.global_words.insert_one({
-                        'word': word,  # Save normalized word
-                        'meaning_data': meaning_data,
-                        'frequency': 1,
-                        'created_at': datetime.now(),
-                        'last_updated': datetime.now()
-                    })
-                    global_word = db.global_words.find_one({'_id': global_word.inserted_id})
-            except ValueError as e:
-                logger.error(f"Error querying word meaning: {str(e)}")
-                return Response(
-                    {'error': str(e)},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
-            except Exception as e:
-                logger.error(f"Unexpected error in word query: {str(e)}")
-                return Response(
-                    {'error': 'An unexpected error occurred while querying the word meaning'},
-                    status=status.HTTP_500_INTERNAL_SERVER_ERROR
-                )
+        # Look up the global dictionary, querying the meaning of a new word only once
+        try:
+            global_word, _ = vocabulary_service.get_or_create(word, qa_service.query_word_meaning)
+            meaning_data = global_word['meaning_data']
+        except ValueError as e:
+            logger.error(f"Error querying word meaning: {str(e)}")
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        except Exception as e:
+            logger.error(f"Unexpected error in word query: {str(e)}")
+            return Response(
+                {'error': 'An unexpected error occurred while querying the word meaning'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
 
         try:
             # Add to user's list
-            db.user_words.update_one(
-                {
-                    'user_id': str(request.user_id),
-                    'word_id': global_word['_id']
-                },
-                {
-                    '$setOnInsert': {
-                        'is_mastered': False,
-                        'is_favorite': False,
-                        'notes': '',
-                        'created_at': datetime.now()
-                    }
-                },
-                upsert=True
-            )
+            mongo_service.add_user_words(str(request.user_id), [global_word['_id']])
         except Exception as e:
             logger.error(f"Error updating user words: {str(e)}")
             # Continue even if user words update fails
@@ -975,39 +994,88 @@ def query_word(request):
             status=status.HTTP_500_INTERNAL_SERVER_ERROR
         )
 
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def query_words_batch(request):
+    """Look up many words at once; new words cost one batched LLM call"""
+    try:
+        words = request.data.get('words')
+        if isinstance(words, str):
+            words = words.split()
+        if not words or not isinstance(words, list):
+            return Response(
+                {'error': 'A list of words is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        words = [str(word).strip() for word in words if str(word).strip()]
+        max_words = getattr(settings, 'VOCABULARY_BATCH_MAX_WORDS', 100)
+        if not words or len(words) > max_words:
+            return Response(
+                {'error': f'Between 1 and {max_words} words are required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        try:
+            global_words, errors = vocabulary_service.get_or_create_many(
+                words, qa_service.query_word_meanings, qa_service.query_word_meaning
+            )
+        except ValueError as e:
+            logger.error(f"Error querying word meanings: {str(e)}")
+            return Response(
+                {'error': str(e)},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+
+        try:
+            # Add all words to user's list with one bulk upsert
+            mongo_service.add_user_words(
+                str(request.user_id),
+                [global_word['_id'] for global_word in global_words.values()]
+            )
+        except Exception as e:
+            logger.error(f"Error updating user words: {str(e)}")
+            # Continue even if user words update fails
+
+        results = []
+        failed = []
+        seen = set()
+        for word in words:
+            normalized = normalize_word(word)
+            if normalized in seen:
+                continue
+            seen.add(normalized)
+            if normalized in global_words:
+                results.append({
+                    'word': word,
+                    'data': global_words[normalized]['meaning_data'],
+                    'frequency': global_words[normalized].get('frequency', 1)
+                })
+            else:
+                failed.append({'word': word, 'error': errors.get(normalized, 'Word could not be resolved')})
+
+        return Response({'results': results, 'errors': failed})
+
+    except Exception as e:
+        logger.error(f"Error in query_words_batch: {str(e)}")
+        return Response(
+            {'error': 'An unexpected error occurred while processing your request'},
+            status=status.HTTP_500_INTERNAL_SERVER_ERROR
+        )
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def toggle_word_favorite(request, word_id):
     try:
-        db = mongo_service.db
+        # Toggle the is_favorite status of the user's word entry
+        new_status = mongo_service.toggle_user_word_favorite(str(request.user_id), word_id)
         
-        # Find the user's word entry
-        user_word = db.user_words.find_one({
-            'user_id': str(request.user_id),
-            'word_id': ObjectId(word_id)
-        })
-        
-        if not user_word:
+        if new_status is None:
             return Response(
                 {'error': 'Word not found in user\'s list'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Toggle the is_favorite status
-        new_status = not user_word.get('is_favorite', False)
-        db.user_words.update_one(
-            {
-                'user_id': str(request.user_id),
-                'word_id': ObjectId(word_id)
-            },
-            {
-                '$set': {
-                    'is_favorite': new_status,
-                    'updated_at': datetime.now()
-                }
-            }
-        )
-        
         return Response({
             'word_id': str(word_id),
             'is_favorite': new_status
@@ -1024,66 +1092,31 @@ def toggle_word_favorite(request, word_id):
 @permission_classes([IsAuthenticated])
 def get_user_words(request):
     try:
-        db = mongo_service.db
-        
         # Get filter parameters
         favorites_only = request.query_params.get('favorites', '').lower() == 'true'
         
-        # Base match condition
-        match_condition = {
-                    'user_id': str(request.user_id)
-                }
-        
-        # Add favorites filter if requested
-        if favorites_only:
-            match_condition['is_favorite'] = True
-        
-        current_time = datetime.now()
-        user_words = list(db.user_words.aggregate([
-            {
-                '$match': match_condition
-            },
-            {
-                '$lookup': {
-                    'from': 'global_words',
-                    'localField': 'word_id',
-                    'foreignField': '_id',
-                    'as': 'word_details'
-                }
-            },
-            {
-                '$unwind': '$word_details'
-            },
-            {
-                '$project': {
-                    '_id': { '$toString': '$_id' },
-                    'word_id': { '$toString': '$word_id' },
-                    'word': '$word_details.word',
-                    'meaning': {
-                        'meaning': '$word_details.meaning_data.meaning',
-                        'example': {
-                            'hindi': '$word_details.meaning_data.example.hindi',
-                            'english': '$word_details.meaning_data.example.english'
-                        }
-                    },
-                    'frequency': { '$ifNull': ['$word_details.frequency', 1] },
-                    'is_mastered': { '$ifNull': ['$is_mastered', False] },
-                    'is_favorite': { '$ifNull': ['$is_favorite', False] },
-                    'notes': { '$ifNull': ['$notes', ''] },
-                    'created_at': { '$ifNull': ['$created_at', current_time] }
-                }
-            },
-            {
-                '$sort': {
-                    'created_at': -1
-                }
-            }
-        ]))
+        # Optional keyset pagination, newest first
+        paginator = MongoCursorPagination(request, sort_field='created_at', direction=-1)
+        user_words, next_cursor = mongo_service.get_user_words(
+            str(request.user_id),
+            favorites_only=favorites_only,
+            paginator=paginator if paginator.enabled else None
+        )
+
+        if not paginator.enabled:
+            return Response({
+                'words': user_words,
+                'count': len(user_words)
+            })
 
         return Response({
             'words': user_words,
-            'count': len(user_words)
+            'count': len(user_words),
+            'next': next_cursor
         })
+    except exceptions.ValidationError:
+        # Invalid cursor or page_size: 400, as for the other paginated endpoints
+        raise
     except Exception as e:
         logger.error(f"Error in get_user_words: {str(e)}")
         return Response(
@@ -1095,35 +1128,15 @@ def get_user_words(request):
 @permission_classes([IsAuthenticated])
 def update_word_notes(request, word_id):
     try:
-        db = mongo_service.db
         notes = request.data.get('notes', '').strip()
         
-        # Find the user's word entry
-        user_word = db.user_words.find_one({
-            'user_id': str(request.user_id),
-            'word_id': ObjectId(word_id)
-        })
-        
-        if not user_word:
+        # Update the notes of the user's word entry
+        if not mongo_service.update_user_word_notes(str(request.user_id), word_id, notes):
             return Response(
                 {'error': 'Word not found in user\'s list'},
                 status=status.HTTP_404_NOT_FOUND
             )
         
-        # Update the notes
-        db.user_words.update_one(
-            {
-                'user_id': str(request.user_id),
-                'word_id': ObjectId(word_id)
-            },
-            {
-                '$set': {
-                    'notes': notes,
-                    'updated_at': datetime.now()
-                }
-            }
-        )
-        
         return Response({
             'word_id': str(word_id),
             'notes': notes
@@ -1139,22 +1152,31 @@ def update_word_notes(request, word_id):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_trending_words(request):
+    """Top words from the in-memory leaderboard; ?window=24h|7d for recent trends"""
     try:
-        db = mongo_service.db
-        # Get top 3 words by frequency
-        trending_words = list(db.global_words.find(
-            {},
-            {'word': 1, 'meaning_data': 1, 'frequency': 1}
-        ).sort('frequency', -1).limit(3))
-
-        # Format the response
-        formatted_words = [{
-            'word': word['word'],
-            'meaning': word['meaning_data']['meaning'],
-            'frequency': word.get('frequency', 1)
-        } for word in trending_words]
-
-        return Response(formatted_words)
+        window = request.query_params.get('window') or None
+        if window is not None and window not in TRENDING_WINDOWS:
+            return Response(
+                {'error': f"window must be one of: {', '.join(TRENDING_WINDOWS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            limit = int(request.query_params.get('limit', 3))
+        except ValueError:
+            limit = 3
+
+        words, etag = trending_service.leaderboard(window)
+        etag = f'{etag[:-1]}-{limit}"'
+        cache_control = f"public, max-age={getattr(settings, 'TRENDING_MAX_AGE', 60)}"
+
+        # Clients that already have this leaderboard get an empty 304
+        if etag in request.headers.get('If-None-Match', ''):
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+        else:
+            response = Response(words[:max(1, limit)])
+        response['ETag'] = etag
+        response['Cache-Control'] = cache_control
+        return response
     except Exception as e:
         logger.error(f"Error fetching trending words: {str(e)}")
         return Response(
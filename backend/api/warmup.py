@@ -0,0 +1,38 @@
+import logging
+import os
+import time
+from django.conf import settings
+from .services.mongo_service import mongo_service
+from .services.user_service import user_service
+from qa_engine.qa_model import qa_model
+
+logger = logging.getLogger(__name__)
+
+
+def warm_up():
+    """
+    Open the connections a worker needs before it serves its first request.
+
+    Nothing connects at import time, so call this from a worker start hook
+    (see gunicorn.conf.py) rather than paying the cost on the first request.
+    Each step is timed and failures are logged, never raised.
+    Returns:
+        dict: Step name -> seconds taken, or the error message
+    """
+    steps = [('mongodb', mongo_service.warm_up)]
+    if getattr(settings, 'WARMUP_ENSURE_INDEXES', False):
+        steps.append(('indexes', user_service.ensure_indexes))
+    if os.getenv('DEEPSEEK_API_KEY'):
+        steps.append(('deepseek', qa_model.warm_up))
+
+    timings = {}
+    for name, step in steps:
+        started = time.perf_counter()
+        try:
+            step()
+            timings[name] = round(time.perf_counter() - started, 3)
+        except Exception as e:
+            logger.error(f"Warm-up step {name} failed: {str(e)}")
+            timings[name] = str(e)
+    logger.info(f"Worker {os.getpid()} warmed up: {timings}")
+    return timings
@@ -80,6 +80,33 @@ def get_transcript(video_id):
         logger.error(f"Full traceback: {traceback.format_exc()}")
         raise ValueError(f"Could not fetch transcript: {str(e)}")
 
+def get_transcript_cached(video_id):
+    """
+    Get transcript through the shared cache, then the persisted raw transcript
+    store, and only fetch from YouTube when the video has never been seen.
+    """
+    from django.conf import settings
+    from django.core.cache import cache
+    from api.services.raw_transcript_store import raw_transcript_store
+
+    cache_key = f'transcript_{video_id}'
+    cached_data = cache.get(cache_key)
+    if cached_data:
+        logger.info("Found transcript in cache")
+        return cached_data
+
+    # get_transcript only ever fetches Hindi or English
+    stored = raw_transcript_store.load(video_id, languages=('hi', 'en'))
+    if stored:
+        logger.info("Found transcript in raw transcript store")
+        transcript_data, language = stored
+    else:
+        transcript_data, language = get_transcript(video_id)
+        raw_transcript_store.save(video_id, language, transcript_data)
+
+    cache.set(cache_key, (transcript_data, language), settings.TRANSCRIPT_CACHE_TIMEOUT)
+    return transcript_data, language
+
 def format_transcript(transcript_data):
     """Format transcript data into readable text."""
     try:
@@ -8,6 +8,11 @@ pip install -r requirements.txt
 # Run migrations
 python manage.py migrate
 
+# Create MongoDB indexes (services no longer create them at import time)
+python manage.py backfill_normalized_words
+python manage.py ensure_indexes
+python manage.py backfill_user_word_dates
+
 # Create static directory if it doesn't exist
 mkdir -p staticfiles
 mkdir -p static
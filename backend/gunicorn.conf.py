@@ -0,0 +1,11 @@
+# Gunicorn configuration, loaded automatically when gunicorn starts in backend/
+# (start.sh); the Procfile, which starts from the repo root, passes it with -c.
+import os
+
+
+def post_worker_init(worker):
+    """Connect to MongoDB and create API clients once the worker has loaded the app"""
+    if os.getenv('WARMUP_ON_START', 'True') != 'True':
+        return
+    from api.warmup import warm_up
+    warm_up()
@@ -4,17 +4,29 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
-client = OpenAI(
-    api_key=os.getenv('DEEPSEEK_API_KEY'),
-    base_url="https://api.deepseek.com/v1"  # Deepseek's API endpoint
-)
+_client = None
+_client_pid = None
+
+def get_client():
+    """
+    Get the Deepseek client, creating it on first use (and again in a forked
+    worker) instead of at import time
+    """
+    global _client, _client_pid
+    if _client is None or _client_pid != os.getpid():
+        _client = OpenAI(
+            api_key=os.getenv('DEEPSEEK_API_KEY'),
+            base_url="https://api.deepseek.com/v1"  # Deepseek's API endpoint
+        )
+        _client_pid = os.getpid()
+    return _client
 
 def deepseek_query(prompt):
     """
     Query the Deepseek API with a prompt
     """
     try:
-        response = client.chat.completions.create(
+        response = get_client().chat.completions.create(
             model="deepseek-chat",  # or whatever model you're using
             messages=[
                 {"role": "system", "content": "You are a helpful assistant that explains Hindi words in English."},
@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class IncrementalJSONArrayParser:
+    """
+    Incrementally extract the elements of one JSON array from streamed text.
+
+    Feed the model output as it arrives; every element of the array stored
+    under `key` (e.g. "qa_pairs" or "vocabulary") is returned by `feed` as
+    soon as its closing bracket has been received. Text before the array,
+    markdown fences and anything after it are ignored.
+    """
+
+    def __init__(self, key):
+        self.key = key
+        self._buffer = ''
+        self._pos = 0
+        self._in_array = False
+        self._done = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._item_start = None
+
+    @property
+    def done(self):
+        return self._done
+
+    def feed(self, text):
+        """
+        Add streamed text
+        Args:
+            text (str): Next piece of the completion
+        Returns:
+            list: Array elements completed by this piece
+        """
+        if self._done or not text:
+            return []
+        self._buffer += text
+        if not self._in_array and not self._find_array_start():
+            return []
+        return self._scan()
+
+    def _find_array_start(self):
+        """Locate the opening bracket of the array under our key"""
+        marker = self._buffer.find(f'"{self.key}"')
+        if marker < 0:
+            return False
+        bracket = self._buffer.find('[', marker)
+        if bracket < 0:
+            return False
+        # Only whitespace and a colon may separate the key from its array
+        if self._buffer[marker + len(self.key) + 2:bracket].strip() != ':':
+            self._buffer = self._buffer[marker + len(self.key) + 2:]
+            return self._find_array_start()
+        self._pos = bracket + 1
+        self._in_array = True
+        return True
+
+    def _scan(self):
+        items = []
+        buffer = self._buffer
+        while self._pos < len(buffer):
+            char = buffer[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == '\\':
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                self._in_string = True
+            elif char in '{[':
+                if self._depth == 0:
+                    self._item_start = self._pos
+                self._depth += 1
+            elif char in '}]':
+                if self._depth == 0 and char == ']':
+                    self._done = True
+                    self._pos += 1
+                    break
+                self._depth -= 1
+                if self._depth == 0:
+                    items.extend(self._emit(buffer[self._item_start:self._pos + 1]))
+                    self._item_start = None
+            self._pos += 1
+
+        # Drop consumed text so long streams do not grow the buffer
+        keep_from = self._item_start if self._item_start is not None else self._pos
+        self._buffer = buffer[keep_from:]
+        self._pos -= keep_from
+        if self._item_start is not None:
+            self._item_start = 0
+        return items
+
+    @staticmethod
+    def _emit(fragment):
+        try:
+            return [json.loads(fragment)]
+        except json.JSONDecodeError as e:
+            logger.error(f"Skipping malformed streamed item: {str(e)}")
+            return []
@@ -3,9 +3,12 @@ import os
 from openai import OpenAI
 from dotenv import load_dotenv
 from .prompts import system, transcript_system
+from .response_cache import response_cache
+from .json_stream import IncrementalJSONArrayParser
 import json
 import logging
 import re
+from concurrent.futures import ThreadPoolExecutor
 
 # Load environment variables from root directory
 root_dir = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
@@ -16,6 +19,10 @@ logger = logging.getLogger(__name__)
 class DeepSeekQAModel:
     _instance = None
     _is_initialized = False
+    model_name = "deepseek-chat"
+    chunk_token_budget = int(os.getenv("TRANSCRIPT_CHUNK_TOKENS", 1500))
+    chunk_workers = int(os.getenv("TRANSCRIPT_CHUNK_WORKERS", 4))
+    word_batch_size = int(os.getenv("WORD_BATCH_SIZE", 40))
 
     # System prompts
     word_system_prompt = """You are a Hindi language teacher explaining words to beginners. Keep explanations clear and concise.
@@ -29,6 +36,60 @@ class DeepSeekQAModel:
         }
     }"""
 
+    word_batch_system_prompt = """You are a Hindi language teacher explaining words to beginners. Keep explanations clear and concise.
+    Format your response as one JSON object with every requested word as a key:
+
+    {
+        "<word>": {
+            "meaning": "simple English meaning (1-2 words)",
+            "example": {
+                "hindi": "one simple example sentence",
+                "english": "its English translation"
+            }
+        }
+    }"""
+
+    # Question prompt templates per question type
+    question_prompt_templates = {
+        "novice": """Generate 3-5 Novice level questions in JSON format.
+                Return questions in this format:
+                {
+                    "qa_pairs": [
+                        {
+                            "question": "question text here",
+                            "answer": "answer text here",
+                            "type": "novice"
+                        }
+                    ]
+                }""",
+        
+        "mcq": """Generate 3-5 Multiple Choice Questions (MCQs) in JSON format.
+                Return questions in this format:
+                {
+                    "qa_pairs": [
+                        {
+                            "question": "question text here",
+                            "answer": "correct answer here",
+                            "type": "mcq",
+                            "options": ["correct answer", "wrong option 1", "wrong option 2", "wrong option 3"]
+                        }
+                    ]
+                }""",
+        
+        "fill_blanks": """Generate 3-5 Fill in the Blanks questions in JSON format.
+                For each question, take a sentence from the text and replace a key word or phrase with '____'.
+                Return questions in this format:
+                {
+                    "qa_pairs": [
+                        {
+                            "question": "sentence with ____ for blank",
+                            "answer": "word or phrase that goes in blank",
+                            "type": "fill_blanks"
+                        }
+                    ]
+                }"""
+    }
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(DeepSeekQAModel, cls).__new__(cls)
@@ -38,10 +99,11 @@ class DeepSeekQAModel:
         if not self._is_initialized:
             self._is_initialized = True
             self.client = None
+            self._client_pid = None
 
     def _ensure_initialized(self):
-        """Lazy initialization of the API client"""
-        if self.client is None:
+        """Lazy initialization of the API client; a forked worker creates its own"""
+        if self.client is None or self._client_pid != os.getpid():
             api_key = os.getenv("DEEPSEEK_API_KEY", "").strip()
             if not api_key:
                 raise ValueError("DEEPSEEK_API_KEY not found in environment variables")
@@ -55,17 +117,43 @@ class DeepSeekQAModel:
                 api_key=api_key,
                 base_url="https://api.deepseek.com/v1"
             )
+            self._client_pid = os.getpid()
+
+    def warm_up(self):
+        """Create the API client before the first request needs it"""
+        self._ensure_initialized()
+
+    def _query_model(self, user_input, system_prompt=None, temperature=None, use_cache=True, parse=None):
+        """
+        Internal method to query the DeepSeek model.
+        Identical requests are answered from the response cache unless
+        use_cache is False. When `parse` is given, the parsed response is
+        returned and the response is only cached once `parse` accepted it,
+        so a truncated or malformed completion is never served again.
+        """
+        system_prompt = system_prompt or system
+        cache_key = None
+        if use_cache:
+            cache_key = response_cache.make_key(self.model_name, system_prompt, user_input, temperature)
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Serving DeepSeek response from cache")
+                if parse is None:
+                    return cached
+                try:
+                    return parse(cached)
+                except Exception:
+                    # Drop an unusable entry and ask the model again
+                    response_cache.delete(cache_key)
 
-    def _query_model(self, user_input, system_prompt=None, temperature=None):
-        """Internal method to query the DeepSeek model"""
         self._ensure_initialized()
         messages = [
-            {"role": "system", "content": system_prompt or system},
+            {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_input}
         ]
         
         params = {
-            "model": "deepseek-chat",
+            "model": self.model_name,
             "messages": messages,
             "stream": False
         }
@@ -73,62 +161,93 @@ class DeepSeekQAModel:
             params["temperature"] = temperature
             
         response = self.client.chat.completions.create(**params)
-        return response.choices[0].message.content
+        content = response.choices[0].message.content
 
-    def generate_questions(self, transcript_text, question_type="novice"):
+        result = parse(content) if parse is not None else content
+        if cache_key is not None:
+            response_cache.set(cache_key, content)
+        return result
+
+    def _stream_model(self, user_input, system_prompt=None, temperature=None, use_cache=True, is_complete=None):
         """
-        Generate questions from transcript text
-        Args:
-            transcript_text (str): The transcript text to generate questions from
-            question_type (str): Type of questions to generate (novice/mcq/fill_blanks)
-        Returns:
-            dict: JSON response containing generated questions
+        Internal method to stream a DeepSeek completion.
+        Yields pieces of the response text as they arrive; cached responses
+        are yielded in one piece and complete streams are added to the cache.
+        When `is_complete` is given, a stream is only cached if it returns
+        True once the whole response has been consumed.
         """
-        prompt_templates = {
-            "novice": """Generate 3-5 Novice level questions in JSON format.
-                Return questions in this format:
-                {
-                    "qa_pairs": [
-                        {
-                            "question": "question text here",
-                            "answer": "answer text here",
-                            "type": "novice"
-                        }
-                    ]
-                }""",
-            
-            "mcq": """Generate 3-5 Multiple Choice Questions (MCQs) in JSON format.
-                Return questions in this format:
-                {
-                    "qa_pairs": [
-                        {
-                            "question": "question text here",
-                            "answer": "correct answer here",
-                            "type": "mcq",
-                            "options": ["correct answer", "wrong option 1", "wrong option 2", "wrong option 3"]
-                        }
-                    ]
-                }""",
-            
-            "fill_blanks": """Generate 3-5 Fill in the Blanks questions in JSON format.
-                For each question, take a sentence from the text and replace a key word or phrase with '____'.
-                Return questions in this format:
-                {
-                    "qa_pairs": [
-                        {
-                            "question": "sentence with ____ for blank",
-                            "answer": "word or phrase that goes in blank",
-                            "type": "fill_blanks"
-                        }
-                    ]
-                }"""
+        system_prompt = system_prompt or system
+        cache_key = None
+        if use_cache:
+            cache_key = response_cache.make_key(self.model_name, system_prompt, user_input, temperature)
+            cached = response_cache.get(cache_key)
+            if cached is not None:
+                logger.info("Serving DeepSeek response from cache")
+                yield cached
+                if is_complete is not None and not is_complete():
+                    response_cache.delete(cache_key)
+                return
+
+        self._ensure_initialized()
+        params = {
+            "model": self.model_name,
+            "messages": [
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_input}
+            ],
+            "stream": True
         }
+        if temperature is not None:
+            params["temperature"] = temperature
 
-        prompt = f"""Please generate questions based on the following transcript text.
+        pieces = []
+        for chunk in self.client.chat.completions.create(**params):
+            if not chunk.choices:
+                continue
+            piece = chunk.choices[0].delta.content
+            if piece:
+                pieces.append(piece)
+                yield piece
+
+        if cache_key is not None and (is_complete is None or is_complete()):
+            response_cache.set(cache_key, ''.join(pieces))
+
+    def _stream_json_items(self, user_input, key, system_prompt=None, temperature=None):
+        """Stream a completion and yield each element of its `key` array once complete"""
+        parser = IncrementalJSONArrayParser(key)
+        stream = self._stream_model(
+            user_input,
+            system_prompt=system_prompt,
+            temperature=temperature,
+            is_complete=lambda: parser.done
+        )
+        for piece in stream:
+            for item in parser.feed(piece):
+                yield item
+
+    @staticmethod
+    def _parse_json_object(response):
+        """Parse the outermost JSON object in a completion, raising ValueError if there is none"""
+        json_start = response.find('{')
+        json_end = response.rfind('}') + 1
+        if json_start < 0 or json_end <= json_start:
+            raise ValueError("No valid JSON found in response")
+        data = json.loads(response[json_start:json_end])
+        if not isinstance(data, dict):
+            raise ValueError("Response JSON is not an object")
+        return data
+
+    def cache_stats(self):
+        """Return hit/miss counters of the response cache"""
+        return response_cache.stats()
+
+    def _build_question_prompt(self, transcript_text, question_type):
+        """Build the question generation prompt for one question type"""
+        return f"""Please generate questions based on the following transcript text.
         Return ONLY a JSON object with NO additional text or formatting.
         
         Instructions:
-        1. {prompt_templates.get(question_type, prompt_templates['novice'])}
+        1. {self.question_prompt_templates.get(question_type, self.question_prompt_templates['novice'])}
         2. Ensure all text is in Hindi
         3. Make questions progressively more challenging
         4. Return ONLY the JSON object, no other text
@@ -137,41 +256,98 @@ class DeepSeekQAModel:
         Transcript Text:
         {transcript_text}"""
 
+    def generate_questions(self, transcript_text, question_type="novice"):
+        """
+        Generate questions from transcript text
+        Args:
+            transcript_text (str): The transcript text to generate questions from
+            question_type (str): Type of questions to generate (novice/mcq/fill_blanks)
+        Returns:
+            dict: JSON response containing generated questions
+        """
+        prompt = self._build_question_prompt(transcript_text, question_type)
+
         try:
-            response = self._query_model(user_input=prompt)
-            
-            # If response is already a list or dict, process it directly
-            if isinstance(response, (list, dict)):
-                if isinstance(response, list):
-                    return {'qa_pairs': response}
-                if 'qa_pairs' in response:
-                    return response['qa_pairs']
-                return {'qa_pairs': [response]}
-            
-            # If response is a string, try to parse it as JSON
             try:
-                # Try to find JSON in the response
-                json_start = response.find('{')
-                json_end = response.rfind('}') + 1
-                
-                if json_start >= 0 and json_end > json_start:
-                    json_str = response[json_start:json_end]
-                    questions = json.loads(json_str)
-                    if isinstance(questions, dict) and 'qa_pairs' in questions:
-                        return questions['qa_pairs']
-                    return {'qa_pairs': questions}
-                else:
-                    logger.error("No JSON found in response:", response)
-                    return []
-            except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON response: {response}")
-                logger.error(f"Error: {str(e)}")
+                questions = self._query_model(user_input=prompt, parse=self._parse_json_object)
+            except ValueError as e:
+                # Includes json.JSONDecodeError; the response was not cached
+                logger.error(f"Failed to parse JSON response: {str(e)}")
                 return []
+
+            if 'qa_pairs' in questions:
+                return questions['qa_pairs']
+            return {'qa_pairs': questions}
                 
         except Exception as e:
             logger.error(f"Error in generate_questions: {str(e)}")
             raise ValueError(f"Failed to generate questions: {str(e)}")
 
+    def stream_questions(self, transcript_text, question_type="novice"):
+        """
+        Generate questions from transcript text, yielding each question as soon
+        as the model has finished writing it
+        Args:
+            transcript_text (str): The transcript text to generate questions from
+            question_type (str): Type of questions to generate (novice/mcq/fill_blanks)
+        Yields:
+            dict: One question dictionary at a time
+        """
+        prompt = self._build_question_prompt(transcript_text, question_type)
+        try:
+            yield from self._stream_json_items(prompt, 'qa_pairs')
+        except Exception as e:
+            logger.error(f"Error in stream_questions: {str(e)}")
+            raise ValueError(f"Failed to generate questions: {str(e)}")
+
+    def generate_questions_combined(self, transcript_text, question_types):
+        """
+        Generate questions of several types with a single prompt
+        Args:
+            transcript_text (str): The transcript text to generate questions from
+            question_types (list): Question types to generate (novice/mcq/fill_blanks)
+        Returns:
+            dict: Mapping of question type to its list of question dictionaries
+        """
+        sections = "\n\n".join(
+            f'"{question_type}": {self.question_prompt_templates[question_type]}'
+            for question_type in question_types
+        )
+        keys = ", ".join(f'"{question_type}"' for question_type in question_types)
+
+        prompt = f"""Please generate questions based on the following transcript text.
+        Return ONLY a JSON object with NO additional text or formatting.
+        The object must have the keys {keys}, each holding the "qa_pairs" list described below.
+        
+        Instructions per key:
+        {sections}
+        
+        General rules:
+        1. Ensure all text is in Hindi
+        2. Make questions progressively more challenging
+        3. Return ONLY the JSON object, no other text
+        4. Ensure the JSON is properly formatted and valid
+        
+        Transcript Text:
+        {transcript_text}"""
+
+        try:
+            data = self._query_model(user_input=prompt, parse=self._parse_json_object)
+            questions_by_type = {}
+            for question_type in question_types:
+                section = data.get(question_type, [])
+                if isinstance(section, dict):
+                    section = section.get('qa_pairs', [])
+                questions_by_type[question_type] = section if isinstance(section, list) else []
+            return questions_by_type
+        except ValueError as e:
+            # Includes json.JSONDecodeError; the response was not cached
+            logger.error(f"Failed to parse JSON response: {str(e)}")
+            return {question_type: [] for question_type in question_types}
+        except Exception as e:
+            logger.error(f"Error in generate_questions_combined: {str(e)}")
+            raise ValueError(f"Failed to generate questions: {str(e)}")
+
     def answer_question(self, context, question):
         """
         Answer a question based on the context
@@ -200,35 +376,63 @@ class DeepSeekQAModel:
         Return ONLY the JSON object."""
         
         try:
-            response = self._query_model(
-                user_input=prompt,
-                system_prompt=self.word_system_prompt
-            )
-
-            # Try to parse JSON from the response
+            # Parse JSON from the response; it is only cached once it parses
             try:
-                # Try to find JSON in the response
-                json_start = response.find('{')
-                json_end = response.rfind('}') + 1
-                
-                if json_start >= 0 and json_end > json_start:
-                    json_str = response[json_start:json_end]
-                    meaning_data = json.loads(json_str)
-                    return meaning_data
-                else:
-                    raise ValueError("No valid JSON found in response")
+                return self._query_model(
+                    user_input=prompt,
+                    system_prompt=self.word_system_prompt,
+                    parse=self._parse_json_object
+                )
             except json.JSONDecodeError as e:
-                logger.error(f"Failed to parse JSON response: {response}")
+                logger.error(f"Failed to parse JSON response for '{word}': {str(e)}")
                 raise ValueError(f"Invalid response format: {str(e)}")
                 
         except Exception as e:
             logger.error(f"Error querying word meaning: {str(e)}")
             raise ValueError(f"Failed to get word meaning: {str(e)}")
 
-    def process_transcript(self, transcript_text: str) -> dict:
+    def query_word_meanings(self, words: list) -> dict:
+        """
+        Get meanings and examples for several Hindi words with one model call
+        per batch of `word_batch_size` words.
+        Returns a dictionary mapping each word, as spelled by the model, to
+        the same structure query_word_meaning returns.
+        """
+        meanings = {}
+        for start in range(0, len(words), self.word_batch_size):
+            batch = words[start:start + self.word_batch_size]
+            prompt = f"""Explain each of these Hindi words with:
+        1. Basic meaning in simple English (keep it brief)
+        2. One simple example sentence showing common usage
+        Words: {json.dumps(batch, ensure_ascii=False)}
+        Return ONLY the JSON object, using the words exactly as given as keys."""
+
+            try:
+                batch_meanings = self._query_model(
+                    user_input=prompt,
+                    system_prompt=self.word_batch_system_prompt,
+                    parse=self._parse_json_object
+                )
+            except json.JSONDecodeError as e:
+                logger.error(f"Failed to parse JSON response for word batch: {str(e)}")
+                raise ValueError(f"Invalid response format: {str(e)}")
+            except Exception as e:
+                logger.error(f"Error querying word meanings: {str(e)}")
+                raise ValueError(f"Failed to get word meanings: {str(e)}")
+
+            meanings.update(
+                (word, data) for word, data in batch_meanings.items() if isinstance(data, dict)
+            )
+        return meanings
+
+    def process_transcript(self, transcript_text: str, chunked=None) -> dict:
         """
         Process Hindi transcript text to add punctuation, translation, and vocabulary.
         Returns a dictionary with punctuated text, translation, and vocabulary.
+
+        Long transcripts are split at sentence boundaries into token-budgeted
+        chunks that are processed concurrently and merged in order. Pass
+        chunked=True/False to force or disable chunking.
         """
         if not transcript_text or not transcript_text.strip():
             raise ValueError("Empty transcript text provided")
@@ -239,7 +443,83 @@ class DeepSeekQAModel:
         # Clean the input text
         transcript_text = transcript_text.strip()
         transcript_text = re.sub(r'\s+', ' ', transcript_text)  # Normalize whitespace
-        
+
+        if chunked is None:
+            chunked = self._estimate_tokens(transcript_text) > self.chunk_token_budget
+        if not chunked:
+            return self._process_transcript_chunk(transcript_text)
+
+        chunks = self._split_into_chunks(transcript_text, self.chunk_token_budget)
+        if len(chunks) == 1:
+            return self._process_transcript_chunk(chunks[0])
+
+        workers = min(self.chunk_workers, len(chunks))
+        logger.info(f"Processing transcript in {len(chunks)} chunks with {workers} workers")
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(self._process_transcript_chunk, chunks))
+
+        return self._merge_processed_chunks(results)
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Rough token estimate; Devanagari needs far more tokens per character than Latin text"""
+        devanagari = len(re.findall(r'[\u0900-\u097F]', text))
+        return devanagari // 2 + (len(text) - devanagari) // 4 + 1
+
+    def _split_into_chunks(self, text: str, max_tokens: int) -> list:
+        """
+        Split text at danda/sentence boundaries into windows of at most max_tokens.
+        Sentences longer than the budget (common in unpunctuated auto captions)
+        are split further at word boundaries.
+        """
+        sentences = [s for s in re.split(r'(?<=[।॥?!.])\s+', text) if s]
+
+        pieces = []
+        for sentence in sentences:
+            if self._estimate_tokens(sentence) <= max_tokens:
+                pieces.append(sentence)
+                continue
+            current = []
+            for word in sentence.split(' '):
+                if current and self._estimate_tokens(' '.join(current + [word])) > max_tokens:
+                    pieces.append(' '.join(current))
+                    current = []
+                current.append(word)
+            if current:
+                pieces.append(' '.join(current))
+
+        chunks = []
+        current = []
+        for piece in pieces:
+            if current and self._estimate_tokens(' '.join(current + [piece])) > max_tokens:
+                chunks.append(' '.join(current))
+                current = []
+            current.append(piece)
+        if current:
+            chunks.append(' '.join(current))
+        return chunks
+
+    @staticmethod
+    def _merge_processed_chunks(results: list) -> dict:
+        """Merge per-chunk results in order, keeping the first occurrence of each vocabulary word"""
+        vocabulary = []
+        seen_words = set()
+        for result in results:
+            for item in result['vocabulary']:
+                word = item['word'].strip()
+                if word in seen_words:
+                    continue
+                seen_words.add(word)
+                vocabulary.append(item)
+
+        return {
+            'punctuated_text': ' '.join(r['punctuated_text'].strip() for r in results),
+            'translation': ' '.join(r['translation'].strip() for r in results),
+            'vocabulary': vocabulary
+        }
+
+    def _process_transcript_chunk(self, transcript_text: str) -> dict:
+        """Process a single window of transcript text with one DeepSeek call"""
         # Construct the user message with STRICT formatting requirements
         user_message = f"""Process this Hindi text and return ONLY a valid JSON object with the following structure:
 {{
@@ -270,13 +550,22 @@ Here is the text to process:
 
 {transcript_text}"""
         
-        # Get response from DeepSeek with very low temperature for consistency
-        response = self._query_model(
-            user_input=user_message,
-            system_prompt=transcript_system,
-            temperature=0.1
-        )
-        
+        # Get response from DeepSeek with very low temperature for consistency;
+        # it is only cached once it parses and validates
+        try:
+            return self._query_model(
+                user_input=user_message,
+                system_prompt=transcript_system,
+                temperature=0.1,
+                parse=self._parse_processed_response
+            )
+        except Exception as e:
+            logger.error(f"Error in process_transcript: {str(e)}")
+            logger.error(f"Original transcript preview: {transcript_text[:200]}")
+            raise ValueError(f"Failed to process transcript: {str(e)}")
+
+    def _parse_processed_response(self, response: str) -> dict:
+        """Parse and validate a transcript processing response, raising ValueError if unusable"""
         # Log the raw response
         print("\n=== RAW RESPONSE FROM DEEPSEEK ===")
         print(response)
@@ -365,9 +654,7 @@ Here is the text to process:
             return self._validate_processed_data(processed_data)
             
         except Exception as e:
-            logger.error(f"Error in process_transcript: {str(e)}")
-            logger.error(f"Original transcript preview: {transcript_text[:200]}")
-            raise ValueError(f"Failed to process transcript: {str(e)}")
+            raise ValueError(str(e))
 
     def _validate_processed_data(self, processed_data: dict) -> dict:
         """Validate the processed data structure and content"""
@@ -0,0 +1,158 @@
+# -*- coding: utf-8 -*-
+import os
+import json
+import time
+import hashlib
+import logging
+import sqlite3
+import threading
+
+logger = logging.getLogger(__name__)
+
+# Default location of the on-disk cache, next to the backend package
+DEFAULT_CACHE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'llm_cache.sqlite3'
+)
+
+
+class ResponseCache:
+    """
+    Persistent, content-addressed cache of LLM completions.
+
+    Entries are keyed by a SHA-256 of (model, system prompt, user prompt,
+    temperature), expire after `ttl` seconds and are evicted least recently
+    used first once the store holds more than `max_entries` rows. A hit only
+    records its access time when the stored one is older than
+    `touch_interval` seconds, so most reads do not write to the shared file.
+    """
+
+    def __init__(self, path=None, ttl=None, max_entries=None, enabled=None, touch_interval=None):
+        self.path = path or os.getenv('LLM_CACHE_PATH', DEFAULT_CACHE_PATH)
+        self.ttl = ttl if ttl is not None else int(os.getenv('LLM_CACHE_TTL', 60 * 60 * 24 * 7))
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv('LLM_CACHE_MAX_ENTRIES', 5000))
+        if touch_interval is None:
+            touch_interval = int(os.getenv('LLM_CACHE_TOUCH_INTERVAL', 60 * 60))
+        self.touch_interval = touch_interval
+        if enabled is None:
+            enabled = os.getenv('LLM_CACHE_ENABLED', 'True') == 'True'
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    @staticmethod
+    def make_key(model, system_prompt, user_prompt, temperature):
+        """Build the content hash for a completion request"""
+        payload = json.dumps(
+            [model, system_prompt, user_prompt, temperature],
+            ensure_ascii=False,
+            separators=(',', ':')
+        )
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _connection(self):
+        """Open the SQLite store lazily, once per process"""
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS responses ('
+                'key TEXT PRIMARY KEY, '
+                'response TEXT NOT NULL, '
+                'created_at REAL NOT NULL, '
+                'last_access REAL NOT NULL)'
+            )
+            self._conn.execute(
+                'CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)'
+            )
+            self._conn.commit()
+            self._pid = os.getpid()
+        return self._conn
+
+    def get(self, key):
+        """Return the cached response for key, or None on a miss"""
+        if not self.enabled:
+            return None
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                row = conn.execute(
+                    'SELECT response, created_at, last_access FROM responses WHERE key = ?', (key,)
+                ).fetchone()
+                if row is None or now - row[1] > self.ttl:
+                    if row is not None:
+                        conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                        conn.commit()
+                    self.misses += 1
+                    return None
+                if now - row[2] > self.touch_interval:
+                    conn.execute('UPDATE responses SET last_access = ? WHERE key = ?', (now, key))
+                    conn.commit()
+                self.hits += 1
+                return row[0]
+        except sqlite3.Error as e:
+            logger.error(f"LLM cache read failed: {str(e)}")
+            self.misses += 1
+            return None
+
+    def set(self, key, response):
+        """Store a response and evict the least recently used overflow"""
+        if not self.enabled or response is None:
+            return
+        now = time.time()
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute(
+                    'INSERT OR REPLACE INTO responses (key, response, created_at, last_access) '
+                    'VALUES (?, ?, ?, ?)',
+                    (key, response, now, now)
+                )
+                conn.execute('DELETE FROM responses WHERE created_at < ?', (now - self.ttl,))
+                conn.execute(
+                    'DELETE FROM responses WHERE key IN ('
+                    'SELECT key FROM responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)',
+                    (self.max_entries,)
+                )
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"LLM cache write failed: {str(e)}")
+
+    def delete(self, key):
+        """Remove one cached response, e.g. one that turned out to be unusable"""
+        if not self.enabled:
+            return
+        try:
+            with self._lock:
+                conn = self._connection()
+                conn.execute('DELETE FROM responses WHERE key = ?', (key,))
+                conn.commit()
+        except sqlite3.Error as e:
+            logger.error(f"LLM cache delete failed: {str(e)}")
+
+    def clear(self):
+        """Remove every cached response and reset the counters"""
+        with self._lock:
+            conn = self._connection()
+            conn.execute('DELETE FROM responses')
+            conn.commit()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self):
+        """Return hit/miss counters for this process"""
+        total = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': (self.hits / total) if total else 0.0,
+            'enabled': self.enabled
+        }
+
+
+# Create a singleton instance
+response_cache = ResponseCache()
@@ -1,13 +1,12 @@
-import os
 from datetime import datetime
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
 from dotenv import load_dotenv
 from youtube_transcript_api import YouTubeTranscriptApi
 import yt_dlp
-from pymongo import MongoClient
-import certifi
 from qa_engine.qa_model import qa_model
+from api.services.raw_transcript_store import RawTranscriptStore
+from api.services.mongo_client import create_mongo_client, get_database_name
 
 # Load environment variables
 load_dotenv()
@@ -33,12 +32,8 @@ class MongoConnection:
     def connect(self):
         """Connect to MongoDB Atlas"""
         try:
-            uri = os.getenv('MONGODB_URI')
-            if not uri:
-                raise ValueError("MONGODB_URI environment variable is not set")
-            
-            self.client = MongoClient(uri, tlsCAFile=certifi.where())
-            self.db = self.client[os.getenv('MONGODB_NAME', 'hindi_qa_db')]
+            self.client = create_mongo_client()
+            self.db = self.client[get_database_name()]
             logger.info("Connected to MongoDB Atlas")
         except Exception as e:
             logger.error(f"Error connecting to MongoDB: {str(e)}")
@@ -89,8 +84,8 @@ def get_available_transcripts(video_id: str) -> List[Dict[str, Any]]:
         logger.error(f"Error listing transcripts for video {video_id}: {str(e)}")
         return None
 
-def get_transcript(video_id: str) -> Optional[str]:
-    """Get transcript for a video with language fallbacks"""
+def fetch_transcript_segments(video_id: str) -> Optional[Tuple[List[Dict[str, Any]], str]]:
+    """Fetch transcript segments from YouTube with language fallbacks"""
     try:
         transcript_list = YouTubeTranscriptApi.list_transcripts(video_id)
         
@@ -98,7 +93,7 @@ def get_transcript(video_id: str) -> Optional[str]:
         for lang in LANGUAGE_PREFERENCES:
             try:
                 transcript = transcript_list.find_manually_created_transcript([lang])
-                return ' '.join(item['text'] for item in transcript.fetch())
+                return transcript.fetch(), transcript.language_code
             except:
                 continue
 
@@ -106,14 +101,14 @@ def get_transcript(video_id: str) -> Optional[str]:
         for lang in LANGUAGE_PREFERENCES:
             try:
                 transcript = transcript_list.find_generated_transcript([lang])
-                return ' '.join(item['text'] for item in transcript.fetch())
+                return transcript.fetch(), transcript.language_code
             except:
                 continue
 
         # If no preferred language found, try any available transcript
         try:
             transcript = transcript_list.find_transcript([])
-            return ' '.join(item['text'] for item in transcript.fetch())
+            return transcript.fetch(), transcript.language_code
         except:
             pass
 
@@ -124,6 +119,19 @@ def get_transcript(video_id: str) -> Optional[str]:
         logger.error(f"Error getting transcript for video {video_id}: {str(e)}")
         return None
 
+def get_transcript(store: RawTranscriptStore, video_id: str) -> Optional[str]:
+    """Get transcript text from the raw transcript store, fetching from YouTube only once per video"""
+    # fetch_transcript_segments falls back to any language, so accept any stored one
+    stored = store.load(video_id, languages=None)
+    if stored is None:
+        stored = fetch_transcript_segments(video_id)
+        if stored is None:
+            return None
+        segments, language = stored
+        store.save(video_id, language, segments)
+    segments, _ = stored
+    return ' '.join(item['text'] for item in segments)
+
 def generate_qa_pairs(text: str, video_id: str) -> List[Dict[str, Any]]:
     """Generate QA pairs from text"""
     qa_pairs = []
@@ -147,9 +155,10 @@ def process_video(db, video: Dict[str, Any]) -> bool:
         video_id = video['video_id']
         logger.info(f"Processing video: {video['title']} ({video_id})")
 
-        # Check available transcripts
-        transcript_list = get_available_transcripts(video_id)
-        if not transcript_list:
+        store = RawTranscriptStore(db)
+
+        # Check available transcripts, unless already stored
+        if store.load(video_id, languages=None) is None and not get_available_transcripts(video_id):
             logger.warning(f"No transcripts available for video {video_id}")
             # Save video as processed but without transcript
             video['processed'] = True
@@ -158,7 +167,7 @@ def process_video(db, video: Dict[str, Any]) -> bool:
             return False
 
         # Get transcript
-        transcript = get_transcript(video_id)
+        transcript = get_transcript(store, video_id)
         if not transcript:
             logger.error(f"Could not get transcript for video {video_id}")
             # Save video as processed but without transcript
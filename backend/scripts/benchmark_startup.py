@@ -0,0 +1,56 @@
+import os
+import statistics
+import subprocess
+import sys
+import argparse
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Time django.setup() plus loading every view module, in a fresh interpreter
+IMPORT_SNIPPET = """
+import os, sys, time
+started = time.perf_counter()
+sys.path.append(os.getcwd())
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'settings')
+import django
+django.setup()
+import urls
+imported = time.perf_counter()
+if os.getenv('BENCHMARK_WARMUP') == 'True':
+    from api.warmup import warm_up
+    warm_up()
+print(imported - started, time.perf_counter() - imported)
+"""
+
+
+def run_once(warm_up):
+    env = dict(os.environ, BENCHMARK_WARMUP=str(warm_up))
+    output = subprocess.run(
+        [sys.executable, '-c', IMPORT_SNIPPET],
+        cwd=BACKEND_DIR,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True
+    ).stdout.strip().splitlines()[-1]
+    import_time, warmup_time = (float(value) for value in output.split())
+    return import_time, warmup_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure backend startup time')
+    parser.add_argument('--runs', type=int, default=5, help='Number of fresh interpreters to start')
+    parser.add_argument('--warm-up', action='store_true', help='Also time api.warmup.warm_up()')
+    args = parser.parse_args()
+
+    results = [run_once(args.warm_up) for _ in range(args.runs)]
+    import_times = [result[0] for result in results]
+    print(f"Import (django.setup + urls): median {statistics.median(import_times):.3f}s, "
+          f"min {min(import_times):.3f}s over {args.runs} runs")
+    if args.warm_up:
+        warmup_times = [result[1] for result in results]
+        print(f"Warm-up: median {statistics.median(warmup_times):.3f}s, min {min(warmup_times):.3f}s")
+
+
+if __name__ == '__main__':
+    main()
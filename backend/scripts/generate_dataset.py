@@ -11,7 +11,7 @@ django.setup()
 
 from api.services.mongo_service import mongo_service
 from qa_engine.qa_model import qa_model
-from youtube_transcript_api import YouTubeTranscriptApi
+from api.youtube_utils import get_transcript_cached
 
 def get_unprocessed_videos():
     """Get videos that haven't been processed yet"""
@@ -53,8 +53,10 @@ def process_video(video):
     print(f"\n🎥 Processing video: {video['title']} ({video_id})")
     
     try:
-        # Get transcript
-        transcript_list = YouTubeTranscriptApi.get_transcript(video_id, languages=['hi'])
+        # Get transcript through the cache shared with the web app
+        transcript_list, language = get_transcript_cached(video_id)
+        if language != 'hi':
+            raise ValueError(f"No Hindi transcript available (got {language})")
         transcript_text = ' '.join(item['text'] for item in transcript_list)
         
         # Save transcript
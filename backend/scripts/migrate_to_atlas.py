@@ -1,14 +1,13 @@
 import os
 import sys
-from pymongo import MongoClient
 from dotenv import load_dotenv
-import certifi
-from urllib.parse import quote_plus
 
 # Set up environment
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 load_dotenv()
 
+from api.services.mongo_client import create_mongo_client
+
 def migrate_to_atlas():
     """Migrate data from local MongoDB to MongoDB Atlas"""
     local_client = None
@@ -16,25 +15,11 @@ def migrate_to_atlas():
     
     try:
         # Connect to local MongoDB
-        local_client = MongoClient('localhost', 27017)
+        local_client = create_mongo_client('mongodb://localhost:27017', tls_ca=False)
         local_db = local_client['hindi_qa_db']
 
         # Connect to MongoDB Atlas
-        uri = os.getenv('MONGODB_URI')
-        if not uri:
-            raise ValueError("MONGODB_URI environment variable is not set")
-
-        # Handle URL encoding of username and password if needed
-        if '<' in uri and '>' in uri:
-            # Extract and encode password
-            start = uri.find(':<') + 2
-            end = uri.find('>', start)
-            if start > 1 and end > start:
-                password = uri[start:end]
-                encoded_password = quote_plus(password)
-                uri = uri.replace(f'<{password}>', encoded_password)
-
-        atlas_client = MongoClient(uri, tlsCAFile=certifi.where())
+        atlas_client = create_mongo_client()
         atlas_db = atlas_client['hindi_qa_db']
 
         # Collections to migrate
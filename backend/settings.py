@@ -52,7 +52,6 @@ INSTALLED_APPS = [
     'rest_framework',
     'corsheaders',
     'rest_framework_simplejwt',
-    'rest_framework_simplejwt.token_blacklist',
     
     # Local apps
     'api',
@@ -106,6 +105,12 @@ WSGI_APPLICATION = 'wsgi.application'
 # MongoDB settings
 MONGODB_URI = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
 MONGODB_NAME = os.getenv('MONGODB_NAME', 'hindi_learning')
+# Client pool and wire options are read from the environment by
+# api.services.mongo_client.create_mongo_client: MONGODB_MAX_POOL_SIZE,
+# MONGODB_MIN_POOL_SIZE, MONGODB_MAX_IDLE_TIME_MS, MONGODB_CONNECT_TIMEOUT_MS,
+# MONGODB_SERVER_SELECTION_TIMEOUT_MS, MONGODB_SOCKET_TIMEOUT_MS,
+# MONGODB_COMPRESSORS, MONGODB_RETRY_WRITES, MONGODB_RETRY_READS and
+# MONGODB_PRACTICE_READ_PREFERENCE (default secondaryPreferred).
 
 # Ensure the database directory exists
 os.makedirs(os.path.dirname(BASE_DIR / 'db.sqlite3'), exist_ok=True)
@@ -273,12 +278,84 @@ LOGGING = {
 }
 
 # Cache settings
-CACHES = {
-    'default': {
+# The default cache is shared by all gunicorn workers and the scripts in
+# backend/scripts/: a MongoDB collection with a TTL index ('mongo'), or a
+# directory on local disk ('file'). 'locmem' keeps a per-process cache.
+CACHE_BACKENDS = {
+    'mongo': {
+        'BACKEND': 'api.cache_backends.MongoCache',
+        'LOCATION': 'cache_entries',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('CACHE_LOCATION', os.path.join(BASE_DIR, 'cache')),
+    },
+    'locmem': {
         'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
         'LOCATION': 'unique-snowflake',
-    }
+    },
+}
+CACHES = {
+    'default': CACHE_BACKENDS[os.getenv('CACHE_BACKEND', 'mongo')]
 }
 
 # Cache timeout for transcripts (24 hours)
 TRANSCRIPT_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Shared per-video transcript processing (processed_videos collection)
+PROCESSED_VIDEO_LEASE_SECONDS = int(os.getenv('PROCESSED_VIDEO_LEASE_SECONDS', 300))
+PROCESSED_VIDEO_WAIT_TIMEOUT = int(os.getenv('PROCESSED_VIDEO_WAIT_TIMEOUT', 300))
+PROCESSED_VIDEO_POLL_INTERVAL = float(os.getenv('PROCESSED_VIDEO_POLL_INTERVAL', 1.0))
+
+# Background transcript imports (import_jobs collection)
+TRANSCRIPT_IMPORT_ASYNC = os.getenv('TRANSCRIPT_IMPORT_ASYNC', 'False') == 'True'
+TRANSCRIPT_IMPORT_WORKERS = int(os.getenv('TRANSCRIPT_IMPORT_WORKERS', 2))
+TRANSCRIPT_IMPORT_HEARTBEAT_INTERVAL = int(os.getenv('TRANSCRIPT_IMPORT_HEARTBEAT_INTERVAL', 30))
+TRANSCRIPT_IMPORT_STALE_SECONDS = int(os.getenv('TRANSCRIPT_IMPORT_STALE_SECONDS', 180))
+
+# Maximum question types generated concurrently in QuestionViewSet.generate
+QUESTION_GENERATION_MAX_WORKERS = int(os.getenv('QUESTION_GENERATION_MAX_WORKERS', 3))
+
+# Maintain a precomputed per-user practice set summary (practice_summaries collection)
+PRACTICE_SUMMARY_ENABLED = os.getenv('PRACTICE_SUMMARY_ENABLED', 'False') == 'True'
+
+# Cursor pagination (opt-in with ?page_size= or ?cursor=)
+API_PAGE_SIZE = int(os.getenv('API_PAGE_SIZE', 50))
+API_MAX_PAGE_SIZE = int(os.getenv('API_MAX_PAGE_SIZE', 200))
+
+# Batch answer counter increments in memory and flush them with bulk_write
+ANSWER_WRITE_BEHIND = os.getenv('ANSWER_WRITE_BEHIND', 'False') == 'True'
+ANSWER_FLUSH_INTERVAL = float(os.getenv('ANSWER_FLUSH_INTERVAL', 2.0))
+ANSWER_FLUSH_MAX_PENDING = int(os.getenv('ANSWER_FLUSH_MAX_PENDING', 500))
+
+# Per-user answer history and progress (user_answers / user_progress), written in batches
+USER_PROGRESS_FLUSH_INTERVAL = float(os.getenv('USER_PROGRESS_FLUSH_INTERVAL', 1.0))
+USER_PROGRESS_FLUSH_MAX_PENDING = int(os.getenv('USER_PROGRESS_FLUSH_MAX_PENDING', 200))
+
+# In-process cache of global_words lookups and buffered frequency counters.
+# The TTL is the only way cached entries are refreshed after global_words is edited.
+VOCABULARY_CACHE_MAX_BYTES = int(os.getenv('VOCABULARY_CACHE_MAX_BYTES', 16 * 1024 * 1024))
+VOCABULARY_CACHE_TTL = int(os.getenv('VOCABULARY_CACHE_TTL', 300))
+WORD_FREQUENCY_FLUSH_INTERVAL = float(os.getenv('WORD_FREQUENCY_FLUSH_INTERVAL', 5.0))
+
+# One LLM meaning lookup per new word across workers (leases collection)
+WORD_LOOKUP_LEASE_SECONDS = int(os.getenv('WORD_LOOKUP_LEASE_SECONDS', 60))
+WORD_LOOKUP_WAIT_TIMEOUT = int(os.getenv('WORD_LOOKUP_WAIT_TIMEOUT', 60))
+WORD_LOOKUP_POLL_INTERVAL = float(os.getenv('WORD_LOOKUP_POLL_INTERVAL', 0.5))
+
+# Maximum words accepted by POST vocabulary/query-batch/
+VOCABULARY_BATCH_MAX_WORDS = int(os.getenv('VOCABULARY_BATCH_MAX_WORDS', 100))
+
+# Add processed transcript vocabulary to global_words
+VOCABULARY_INGEST_ENABLED = os.getenv('VOCABULARY_INGEST_ENABLED', 'True') == 'True'
+
+# Trending words leaderboard (served from memory, see api.services.trending_service)
+TRENDING_SIZE = int(os.getenv('TRENDING_SIZE', 20))
+TRENDING_REFRESH_INTERVAL = int(os.getenv('TRENDING_REFRESH_INTERVAL', 30))
+TRENDING_MAX_AGE = int(os.getenv('TRENDING_MAX_AGE', 60))
+
+# Memory budget for verified access tokens kept until their expiry (api.middleware)
+JWT_VERIFIED_CACHE_MAX_BYTES = int(os.getenv('JWT_VERIFIED_CACHE_MAX_BYTES', 1024 * 1024))
+
+# Also reconcile the users indexes when a worker warms up (see api.warmup)
+WARMUP_ENSURE_INDEXES = os.getenv('WARMUP_ENSURE_INDEXES', 'False') == 'True'
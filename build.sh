@@ -14,5 +14,10 @@ mkdir -p static staticfiles
 # Run Django migrations
 python manage.py migrate
 
+# Create MongoDB indexes (services no longer create them at import time)
+python manage.py backfill_normalized_words
+python manage.py ensure_indexes
+python manage.py backfill_user_word_dates
+
 # Collect static files
 python manage.py collectstatic --no-input 
\ No newline at end of file